@@ -0,0 +1,138 @@
+"""
+Cache versionado para valores caros de calcular (ex.: métricas do dashboard).
+
+As chaves são organizadas em famílias (KeyFamily): 'product_metrics', 'sales_metrics', ...
+Cada família tem um número de versão guardado no próprio cache, e os valores são gravados em
+'<família>:v<versão>[:<partes>]'. Invalidar é só incrementar a versão (feito pelos signals dos
+models, após o commit da transação). O prefixo global das chaves vem de CACHES['default']['KEY_PREFIX'].
+
+Quando a versão atual não está no cache, apenas um processo recalcula (lock via cache.add);
+os demais continuam servindo o último valor calculado ('<família>:latest') até o novo ficar pronto.
+O lock só é garantido entre processos em backends com add atômico (Redis, memcached); no cache em
+arquivo (padrão de desenvolvimento) dois processos podem recalcular o mesmo valor, sem prejuízo
+além do trabalho repetido.
+
+Cada processo conta acertos, faltas e valores antigos servidos por família (get_stats()); durante
+uma requisição medida pelo RequestMetricsMiddleware, os eventos também vão para request_events.
+"""
+import contextvars
+import threading
+import time
+from collections import Counter
+from django.core.cache import cache
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.db import transaction
+
+
+# Tempo máximo (segundos) que um processo pode segurar o lock de recálculo.
+LOCK_TIMEOUT = 30
+
+# Sem valor antigo para servir, os demais processos aguardam o recálculo por até ~1s.
+WAIT_INTERVAL = 0.05
+WAIT_ATTEMPTS = 20
+
+_stats = {}
+_stats_lock = threading.Lock()
+
+# Counter de eventos ('<família>:<evento>') da requisição atual, ou None fora de uma requisição medida.
+request_events = contextvars.ContextVar('cache_request_events', default=None)
+
+
+def _count(family, event):
+    with _stats_lock:
+        _stats.setdefault(family, Counter())[event] += 1
+    events = request_events.get()
+    if events is not None:
+        events[f'{family}:{event}'] += 1
+
+
+def get_stats():
+    """Contadores deste processo por família: hits, misses (recalculados) e stale (valor antigo servido)."""
+    with _stats_lock:
+        return {family: dict(counter) for family, counter in _stats.items()}
+
+
+def _new_version():
+    # Versões iniciais baseadas no relógio evitam reaproveitar valores antigos se a chave
+    # de versão for descartada pelo cache (ex.: LRU do memcached).
+    return time.time_ns()
+
+
+class KeyFamily:
+    """Conjunto de chaves de cache invalidadas juntas."""
+
+    def __init__(self, name, timeout=DEFAULT_TIMEOUT):
+        self.name = name
+        self.timeout = timeout
+
+    def __str__(self):
+        return self.name
+
+    @property
+    def version_key(self):
+        return f'{self.name}:version'
+
+    def get_version(self):
+        version = cache.get(self.version_key)
+        if version is None:
+            cache.add(self.version_key, _new_version(), None)
+            version = cache.get(self.version_key)
+        return version
+
+    def bump_version(self):
+        # Nova versão pelo relógio em vez de cache.incr: o incr não é atômico em todos os backends
+        # (ex.: cache em arquivo) e um incremento perdido manteria a versão antiga. Com set, mesmo
+        # duas invalidações simultâneas deixam uma versão que nunca foi usada antes.
+        cache.set(self.version_key, _new_version(), None)
+
+    def invalidate(self):
+        """Invalida a família quando a transação atual for confirmada (ou imediatamente, fora de uma)."""
+        transaction.on_commit(self.bump_version)
+
+    def key(self, *parts):
+        return ':'.join([self.name, f'v{self.get_version()}', *map(str, parts)])
+
+    def get_or_compute(self, compute, *parts):
+        """Retorna o valor da versão atual, recalculando com `compute()` em voo único."""
+        key = self.key(*parts)
+        value = cache.get(key)
+        if value is not None:
+            _count(self.name, 'hits')
+            return value
+
+        latest_key = ':'.join([self.name, 'latest', *map(str, parts)])
+        lock_key = f'{key}:lock'
+        if cache.add(lock_key, True, LOCK_TIMEOUT):
+            try:
+                value = compute()
+                cache.set(key, value, self.timeout)
+                cache.set(latest_key, value, None)
+            finally:
+                cache.delete(lock_key)
+            _count(self.name, 'misses')
+            return value
+
+        # Outro processo já está recalculando: serve o último valor conhecido.
+        value = cache.get(latest_key)
+        if value is not None:
+            _count(self.name, 'stale')
+            return value
+
+        for _ in range(WAIT_ATTEMPTS):
+            time.sleep(WAIT_INTERVAL)
+            value = cache.get(key)
+            if value is not None:
+                _count(self.name, 'hits')
+                return value
+        _count(self.name, 'misses')
+        return compute()
+
+
+def invalidate(*families):
+    for family in families:
+        family.invalidate()
+
+
+PRODUCT_METRICS = KeyFamily('product_metrics')
+SALES_METRICS = KeyFamily('sales_metrics')
+CATALOG_CHOICES = KeyFamily('catalog_choices')
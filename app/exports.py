@@ -0,0 +1,148 @@
+"""
+Base compartilhada das exportações (CSV e Excel) das listagens.
+
+Cada listagem expõe seus filtros em `filter_queryset(queryset, params)`, um método de classe
+que recebe os parâmetros da URL (ou qualquer dict): a listagem e a exportação aplicam
+exatamente os mesmos filtros. As colunas são pares (cabeçalho, lookup) lidos com
+values_list, então campos de modelos relacionados (ex.: 'product__title') vêm no mesmo
+SELECT, sem uma consulta por linha.
+
+O CSV é um StreamingHttpResponse alimentado por queryset.iterator(): as linhas são lidas do
+banco em blocos e enviadas conforme são geradas, com memória constante. O XLSX usa a planilha
+write_only do openpyxl (cada linha é serializada no append, sem manter células em memória),
+grava o arquivo em um temporário em disco e o devolve com FileResponse.
+"""
+import csv
+import tempfile
+from datetime import datetime
+from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
+from django.http import FileResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.views import View
+from openpyxl import Workbook
+
+
+DATETIME_FORMAT = '%d-%m-%Y %H:%M:%S'
+
+
+class FilteredListMixin:
+    """Aplica filter_queryset aos parâmetros da requisição em um ListView."""
+
+    @classmethod
+    def filter_queryset(cls, queryset, params):
+        return queryset
+
+    def get_queryset(self):
+        return self.filter_queryset(super().get_queryset(), self.request.GET)
+
+
+def format_value(value):
+    if value is None:
+        return ''
+    if isinstance(value, datetime):
+        if timezone.is_aware(value):
+            value = timezone.localtime(value)
+        return value.strftime(DATETIME_FORMAT)
+    return value
+
+
+class Echo:
+    """Objeto com a interface de arquivo que o csv.writer espera; devolve a linha em vez de guardá-la."""
+
+    def write(self, value):
+        return value
+
+
+class ExportView(LoginRequiredMixin, PermissionRequiredMixin, View):
+    """
+    Base das views de exportação.
+
+    Subclasses definem list_view (a listagem cujos filtros são reaproveitados), columns
+    e filename (sem extensão). Fora de uma requisição (exportações em segundo plano), a view
+    é instanciada com params (os filtros) e, opcionalmente, on_progress(linhas_escritas).
+    """
+    list_view = None
+    columns = ()
+    filename = None
+    extension = None
+    chunk_size = 2000
+    params = None
+    on_progress = None
+
+    @property
+    def headers(self):
+        return [header for header, _ in self.columns]
+
+    def get_params(self):
+        return self.params if self.params is not None else self.request.GET
+
+    def get_queryset(self):
+        queryset = self.list_view.model._default_manager.all()
+        return self.list_view.filter_queryset(queryset, self.get_params())
+
+    def iter_rows(self):
+        lookups = [lookup for _, lookup in self.columns]
+        rows = self.get_queryset().values_list(*lookups).iterator(chunk_size=self.chunk_size)
+        count = 0
+        for count, row in enumerate(rows, start=1):
+            yield [format_value(value) for value in row]
+            if self.on_progress and count % self.chunk_size == 0:
+                self.on_progress(count)
+        if self.on_progress:
+            self.on_progress(count)
+
+    def write_file(self, target):
+        """Grava a exportação completa em `target` (caminho; o XLSX também aceita um arquivo aberto)."""
+        raise NotImplementedError
+
+
+class CSVExportView(ExportView):
+    """Exporta a listagem filtrada como CSV (UTF-8 com BOM, reconhecido pelo Excel)."""
+    extension = 'csv'
+
+    def stream(self):
+        writer = csv.writer(Echo())
+        yield '\ufeff'  # BOM
+        yield writer.writerow(self.headers)
+        for row in self.iter_rows():
+            yield writer.writerow(row)
+
+    def write_file(self, target):
+        with open(target, 'w', encoding='utf-8', newline='') as file:
+            for line in self.stream():
+                file.write(line)
+
+    def get(self, request, *args, **kwargs):
+        response = StreamingHttpResponse(self.stream(), content_type='text/csv; charset=utf-8')
+        response['Content-Disposition'] = f'attachment; filename="{self.filename}.csv"'
+        return response
+
+
+class ExcelExportView(ExportView):
+    """Exporta a listagem filtrada como XLSX; sheet_title é o nome da aba (padrão: filename)."""
+    extension = 'xlsx'
+    sheet_title = None
+
+    def write_file(self, target):
+        workbook = Workbook(write_only=True)
+        worksheet = workbook.create_sheet(self.sheet_title or self.filename)
+        worksheet.append(self.headers)
+        for row in self.iter_rows():
+            worksheet.append(row)
+        workbook.save(target)
+
+    def get(self, request, *args, **kwargs):
+        # O arquivo temporário é apagado quando o FileResponse o fecha, ao fim do envio.
+        file = tempfile.TemporaryFile(suffix='.xlsx')
+        try:
+            self.write_file(file)
+        except BaseException:
+            file.close()
+            raise
+        file.seek(0)
+        return FileResponse(
+            file,
+            as_attachment=True,
+            filename=f'{self.filename}.xlsx',
+            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        )
@@ -0,0 +1,76 @@
+"""
+Filtros das APIs de listagem (REST_FRAMEWORK['DEFAULT_FILTER_BACKENDS']).
+
+    ?product=<id>                 entradas e saídas de um produto
+    ?created_at__gte=<data>       criados a partir da data (ou data e hora, ISO 8601)
+    ?created_at__lte=<data>       criados até a data, inclusive o dia inteiro
+    ?updated_at__gt=<data e hora> alterados depois do instante (sincronização incremental)
+
+Os filtros só se aplicam aos modelos que têm o campo; valores inválidos respondem 400.
+Todos são atendidos por índices (chave estrangeira de product, created_at e updated_at).
+"""
+from datetime import datetime, time, timedelta
+from django.core.exceptions import FieldDoesNotExist
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+
+def parse_moment(value, param):
+    """
+    Converte uma data ou data e hora ISO 8601: retorna (datetime com fuso, só_data).
+    Para uma data sem hora, o datetime é a meia-noite do dia.
+    """
+    try:
+        moment = parse_datetime(value)
+        date_only = moment is None
+        if date_only:
+            day = parse_date(value)
+            if day is None:
+                raise ValueError
+            moment = datetime.combine(day, time.min)
+    except ValueError:
+        raise ValidationError({param: 'Informe uma data (AAAA-MM-DD) ou data e hora ISO 8601.'})
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment, date_only
+
+
+def has_field(model, name):
+    try:
+        model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return False
+    return True
+
+
+class ApiFilterBackend(BaseFilterBackend):
+
+    def filter_queryset(self, request, queryset, view):
+        params = request.query_params
+        model = queryset.model
+
+        product = params.get('product')
+        if product and has_field(model, 'product'):
+            if not product.isdigit():
+                raise ValidationError({'product': 'Informe o id numérico do produto.'})
+            queryset = queryset.filter(product_id=product)
+
+        if has_field(model, 'created_at'):
+            if params.get('created_at__gte'):
+                start, _ = parse_moment(params['created_at__gte'], 'created_at__gte')
+                queryset = queryset.filter(created_at__gte=start)
+            if params.get('created_at__lte'):
+                end, date_only = parse_moment(params['created_at__lte'], 'created_at__lte')
+                if date_only:
+                    # Inclui o dia inteiro com created_at < dia seguinte (__date anularia o índice).
+                    queryset = queryset.filter(created_at__lt=end + timedelta(days=1))
+                else:
+                    queryset = queryset.filter(created_at__lte=end)
+
+        if params.get('updated_at__gt') and has_field(model, 'updated_at'):
+            since, _ = parse_moment(params['updated_at__gt'], 'updated_at__gt')
+            queryset = queryset.filter(updated_at__gt=since)
+
+        return queryset
@@ -0,0 +1,235 @@
+"""
+Métricas de requisições por rota (nome da URL): consultas SQL, tempo de banco, acertos e faltas
+do cache versionado (app.cache) e tempo total, coletadas pelo RequestMetricsMiddleware.
+
+Os valores ficam em histogramas na memória de cada processo, com buckets fixos como no
+Prometheus: registrar uma requisição custa algumas somas sob um lock. Com vários workers,
+cada processo tem os seus números; para agregá-los, use o endpoint no formato do Prometheus.
+
+Os endpoints expõem ainda os contadores do cache versionado de todo o processo
+(app.cache.get_stats), e não só das requisições amostradas. Também conta as conexões com o banco
+(sinal connection_created, ligado em app.signals) e, com o pool do psycopg ativo (SGE_DB_POOL),
+expõe o tamanho do pool e a espera por conexões.
+"""
+import threading
+from bisect import bisect_left
+from collections import Counter
+from django.db import connections
+from app import cache
+
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+_routes = {}
+_connections_created = Counter()
+_lock = threading.Lock()
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0
+        self.max = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, fraction):
+        """Limite superior do bucket que contém o quantil (o máximo observado, no último bucket)."""
+        if not self.count:
+            return None
+        target = fraction * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= target:
+                return min(bound, self.max)
+        return self.max
+
+    def cumulative(self):
+        """Pares (limite, contagem acumulada) no formato dos buckets do Prometheus."""
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            yield bound, seen
+        yield '+Inf', self.count
+
+    def summary(self, digits):
+        if not self.count:
+            return {'avg': None, 'p50': None, 'p95': None, 'max': None}
+        return {
+            'avg': round(self.sum / self.count, digits),
+            'p50': round(self.quantile(0.5), digits),
+            'p95': round(self.quantile(0.95), digits),
+            'max': round(self.max, digits),
+        }
+
+
+class RouteMetrics:
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.duration = Histogram(DURATION_BUCKETS)
+        self.db_time = Histogram(DURATION_BUCKETS)
+        self.queries = Histogram(QUERY_BUCKETS)
+        self.cache = Counter()
+
+
+def record(route, duration, db_time, queries, status_code, cache_events):
+    with _lock:
+        metrics = _routes.get(route)
+        if metrics is None:
+            metrics = _routes[route] = RouteMetrics()
+        metrics.requests += 1
+        if status_code >= 500:
+            metrics.errors += 1
+        metrics.duration.observe(duration)
+        metrics.db_time.observe(db_time)
+        metrics.queries.observe(queries)
+        metrics.cache.update(cache_events)
+
+
+def record_connection(alias):
+    with _lock:
+        _connections_created[alias] += 1
+
+
+def reset():
+    with _lock:
+        _routes.clear()
+        _connections_created.clear()
+
+
+def snapshot():
+    """Resumo por rota (requisições amostradas), da mais lenta para a mais rápida no p95."""
+    with _lock:
+        report = {
+            route: {
+                'requests': metrics.requests,
+                'errors': metrics.errors,
+                'duration_seconds': metrics.duration.summary(4),
+                'db_seconds': metrics.db_time.summary(4),
+                'queries': metrics.queries.summary(1),
+                'cache': dict(metrics.cache),
+            }
+            for route, metrics in _routes.items()
+        }
+    return dict(sorted(report.items(), key=lambda item: -(item[1]['duration_seconds']['p95'] or 0)))
+
+
+def database_snapshot():
+    """
+    Por banco: conexões feitas por este processo, a configuração de reaproveitamento e, com o
+    pool ativo, as estatísticas do psycopg_pool (tamanho, conexões abertas e livres, pedidos
+    esperando e o tempo total de espera). Sem o pool, muitas conexões com CONN_MAX_AGE > 0 indicam
+    que elas não estão sendo reaproveitadas; com o pool, connections_created conta empréstimos
+    e as conexões abertas de fato estão em pool.connections.
+    """
+    with _lock:
+        created = dict(_connections_created)
+    report = {}
+    for alias in connections:
+        connection = connections[alias]
+        pool = getattr(connection, 'pool', None)
+        report[alias] = {
+            'vendor': connection.vendor,
+            'connections_created': created.get(alias, 0),
+            'conn_max_age': connection.settings_dict['CONN_MAX_AGE'],
+            'health_checks': connection.settings_dict['CONN_HEALTH_CHECKS'],
+            'pool': _pool_stats(pool) if pool is not None else None,
+        }
+    return report
+
+
+def _pool_stats(pool):
+    # get_stats() omite os contadores ainda zerados.
+    stats = pool.get_stats()
+    return {
+        'min_size': stats['pool_min'],
+        'max_size': stats['pool_max'],
+        'size': stats['pool_size'],
+        'available': stats['pool_available'],
+        'requests_waiting': stats['requests_waiting'],
+        'requests': stats.get('requests_num', 0),
+        'requests_queued': stats.get('requests_queued', 0),
+        'requests_timed_out': stats.get('requests_errors', 0),
+        'connections': stats.get('connections_num', 0),
+        'wait_seconds': stats.get('requests_wait_ms', 0) / 1000,
+        'connections_lost': stats.get('connections_lost', 0),
+    }
+
+
+def _histogram_lines(name, route, histogram):
+    for bound, count in histogram.cumulative():
+        yield f'{name}_bucket{{route="{route}",le="{bound}"}} {count}'
+    yield f'{name}_sum{{route="{route}"}} {histogram.sum}'
+    yield f'{name}_count{{route="{route}"}} {histogram.count}'
+
+
+def render_prometheus():
+    """Métricas deste processo no formato texto do Prometheus."""
+    histograms = (
+        ('sge_request_duration_seconds', 'Tempo total da requisição.', 'duration'),
+        ('sge_request_db_seconds', 'Tempo gasto em consultas SQL na requisição.', 'db_time'),
+        ('sge_request_queries', 'Consultas SQL por requisição.', 'queries'),
+    )
+    with _lock:
+        routes = sorted(_routes.items())
+        lines = []
+        for name, description, attribute in histograms:
+            lines += [f'# HELP {name} {description}', f'# TYPE {name} histogram']
+            for route, metrics in routes:
+                lines.extend(_histogram_lines(name, route, getattr(metrics, attribute)))
+        lines += ['# HELP sge_request_errors_total Respostas 5xx.', '# TYPE sge_request_errors_total counter']
+        lines += [f'sge_request_errors_total{{route="{route}"}} {metrics.errors}' for route, metrics in routes]
+        lines += ['# HELP sge_request_cache_total Eventos do cache versionado.', '# TYPE sge_request_cache_total counter']
+        for route, metrics in routes:
+            for event, count in sorted(metrics.cache.items()):
+                lines.append(f'sge_request_cache_total{{route="{route}",event="{event}"}} {count}')
+    lines.extend(_cache_lines(cache.get_stats()))
+    lines.extend(_database_lines(database_snapshot()))
+    return '\n'.join(lines) + '\n'
+
+
+def _cache_lines(families):
+    # Todas as requisições do processo (e comandos), não só as amostradas pelo middleware.
+    yield '# HELP sge_cache_events_total Acertos, faltas e valores antigos servidos do cache versionado.'
+    yield '# TYPE sge_cache_events_total counter'
+    for family, events in sorted(families.items()):
+        for event, count in sorted(events.items()):
+            yield f'sge_cache_events_total{{family="{family}",event="{event}"}} {count}'
+
+
+def _database_lines(databases):
+    yield '# HELP sge_db_connections_created_total Conexões com o banco feitas por este processo (com pool, empréstimos).'
+    yield '# TYPE sge_db_connections_created_total counter'
+    for alias, database in sorted(databases.items()):
+        yield f'sge_db_connections_created_total{{alias="{alias}"}} {database["connections_created"]}'
+
+    pools = sorted((alias, database['pool']) for alias, database in databases.items() if database['pool'])
+    series = (
+        ('sge_db_pool_max_size', 'gauge', 'Tamanho máximo do pool.', 'max_size'),
+        ('sge_db_pool_size', 'gauge', 'Conexões abertas pelo pool.', 'size'),
+        ('sge_db_pool_available', 'gauge', 'Conexões livres no pool.', 'available'),
+        ('sge_db_pool_requests_waiting', 'gauge', 'Pedidos esperando uma conexão.', 'requests_waiting'),
+        ('sge_db_pool_requests_total', 'counter', 'Conexões pedidas ao pool.', 'requests'),
+        ('sge_db_pool_requests_queued_total', 'counter', 'Pedidos que tiveram de esperar.', 'requests_queued'),
+        ('sge_db_pool_requests_timed_out_total', 'counter', 'Pedidos sem conexão dentro do timeout.',
+         'requests_timed_out'),
+        ('sge_db_pool_wait_seconds_total', 'counter', 'Tempo total de espera por conexões.', 'wait_seconds'),
+        ('sge_db_pool_connections_total', 'counter', 'Conexões abertas pelo pool com o servidor.', 'connections'),
+        ('sge_db_pool_connections_lost_total', 'counter', 'Conexões descartadas por falha.', 'connections_lost'),
+    )
+    if not pools:
+        return
+    for name, kind, description, key in series:
+        yield f'# HELP {name} {description}'
+        yield f'# TYPE {name} {kind}'
+        for alias, pool in pools:
+            yield f'{name}{{alias="{alias}"}} {pool[key]}'
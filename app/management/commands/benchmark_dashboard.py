@@ -0,0 +1,75 @@
+import statistics
+import time
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncClient, Client, override_settings
+from django.urls import reverse
+from app import metrics
+from app.cache import PRODUCT_METRICS, SALES_METRICS
+
+
+class Command(BaseCommand):
+    help = (
+        'Compara a latência do dashboard com o cache frio: widgets calculados em sequência, em '
+        'paralelo (metrics.aget_dashboard) e a view /dashboard/ servida pelos handlers WSGI e ASGI. '
+        'Use sobre um volume grande de dados (ver generate_fake_data).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=5, help='Execuções medidas por modo.')
+        parser.add_argument('--days', type=int, default=365, choices=metrics.SALES_WINDOWS,
+                            help='Janela das séries de vendas.')
+
+    def handle(self, *args, **options):
+        if options['repeat'] < 1:
+            raise CommandError('--repeat deve ser maior que zero.')
+        days = options['days']
+        names = list(metrics.DASHBOARD_WIDGETS)
+        url = f'{reverse("dashboard")}?days={days}'
+
+        # Os widgets rodam em outras threads (e conexões): o usuário precisa estar gravado de fato.
+        user = User.objects.create_superuser('dashboard-benchmark', password=None)
+        try:
+            with override_settings(
+                CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+                ALLOWED_HOSTS=['testserver'],
+            ):
+                wsgi = Client()
+                wsgi.force_login(user)
+                asgi = AsyncClient()
+                async_to_sync(asgi.aforce_login)(user)
+
+                modes = (
+                    ('sequencial', lambda: metrics.get_dashboard(names, days)),
+                    ('paralelo', lambda: async_to_sync(metrics.aget_dashboard)(names, days)),
+                    ('WSGI /dashboard/', lambda: self.check_response(wsgi.get(url))),
+                    ('ASGI /dashboard/', lambda: self.check_response(async_to_sync(asgi.get)(url))),
+                )
+                results = {label: self.measure(run, options['repeat']) for label, run in modes}
+        finally:
+            user.delete()
+
+        baseline = results['sequencial']
+        for label, latency in results.items():
+            self.stdout.write(
+                f'{label}: {latency:.1f} ms (mediana, cache frio), {baseline / latency:.1f}x o sequencial'
+            )
+        self.stdout.write(self.style.SUCCESS(f'{len(names)} widgets, {settings.DASHBOARD_WORKERS} threads.'))
+
+    def measure(self, run, repeat):
+        run()  # aquece imports, conexões e o plano das consultas
+        latencies = []
+        for _ in range(repeat):
+            # Cache frio: nova versão das famílias, como logo após uma venda ou alteração de produto.
+            PRODUCT_METRICS.bump_version()
+            SALES_METRICS.bump_version()
+            started = time.perf_counter()
+            run()
+            latencies.append((time.perf_counter() - started) * 1000)
+        return statistics.median(latencies)
+
+    def check_response(self, response):
+        if response.status_code != 200:
+            raise CommandError(f'/dashboard/ respondeu {response.status_code}.')
@@ -0,0 +1,62 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.core.paginator import Paginator
+from django.template import Template, RequestContext
+from django.template.loader import get_template
+from django.test import RequestFactory
+import time
+
+
+# Laço antigo do componente, mantido aqui apenas para comparação.
+LEGACY_TEMPLATE = Template('''
+{% for page_number in page_obj.paginator.page_range %}
+  {% if page_number <= page_obj.number|add:3 and page_number >= page_obj.number|add:-3 %}
+    <a href="?page={{ page_number }}">{{ page_number }}</a>
+  {% endif %}
+{% endfor %}
+''')
+
+
+class Command(BaseCommand):
+    help = (
+        'Mede o tempo de renderização do componente de paginação (components/_pagination.html) '
+        'sobre uma listagem simulada, sem acessar o banco.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1_000_000, help='Quantidade de linhas simuladas.')
+        parser.add_argument('--per-page', type=int, default=10, help='Linhas por página.')
+        parser.add_argument('--repeat', type=int, default=200, help='Renderizações por página medida.')
+        parser.add_argument(
+            '--legacy',
+            action='store_true',
+            help='Também mede o laço antigo sobre page_range (lento: uma renderização por página medida).',
+        )
+
+    def handle(self, *args, **options):
+        if options['rows'] < 1 or options['per_page'] < 1 or options['repeat'] < 1:
+            raise CommandError('--rows, --per-page e --repeat devem ser maiores que zero.')
+
+        paginator = Paginator(range(options['rows']), options['per_page'])
+        component = get_template('components/_pagination.html')
+        request = RequestFactory().get('/outflows/list/', {'product': 'Produto 1'})
+
+        self.stdout.write(self.style.NOTICE(
+            f'{options["rows"]} linhas, {paginator.num_pages} páginas de {options["per_page"]}.'
+        ))
+        for number in sorted({1, paginator.num_pages // 2 or 1, paginator.num_pages}):
+            page_obj = paginator.page(number)
+            context = {'page_obj': page_obj}
+            elapsed = self.measure(lambda: component.render(context, request), options['repeat'])
+            self.stdout.write(self.style.SUCCESS(f'Página {number}: {elapsed * 1000:.3f} ms por renderização'))
+
+            if options['legacy']:
+                legacy_context = RequestContext(request, context)
+                elapsed = self.measure(lambda: LEGACY_TEMPLATE.render(legacy_context), 1)
+                self.stdout.write(self.style.WARNING(f'Página {number} (laço antigo): {elapsed * 1000:.3f} ms'))
+
+    def measure(self, render, repeat):
+        render()
+        started = time.perf_counter()
+        for _ in range(repeat):
+            render()
+        return (time.perf_counter() - started) / repeat
@@ -0,0 +1,12 @@
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = (
+        'Atalho para `manage.py test app.tests.QueryBudgetTest`: verifica o orçamento de consultas SQL '
+        'das listagens, detalhes, exportações, widgets e APIs com 1 linha e com várias páginas de dados.'
+    )
+
+    def handle(self, *args, **options):
+        call_command('test', 'app.tests.QueryBudgetTest', verbosity=options['verbosity'])
@@ -0,0 +1,160 @@
+import random
+import time
+from itertools import accumulate
+from contextlib import contextmanager, nullcontext
+from datetime import timedelta
+from decimal import Decimal
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from app.cache import invalidate, CATALOG_CHOICES, PRODUCT_METRICS, SALES_METRICS
+from brands.models import Brand
+from categories.models import Category
+from inflows.models import Inflow
+from outflows.models import Outflow
+from products.models import Product
+from suppliers.models import Supplier
+
+
+@contextmanager
+def explicit_created_at(model):
+    """
+    Permite gravar created_at com bulk_create (auto_now_add sobrescreveria a data sorteada).
+    O campo é compartilhado pelo processo todo: use só em volta do INSERT.
+    """
+    field = model._meta.get_field('created_at')
+    auto_now_add = field.auto_now_add
+    field.auto_now_add = False
+    try:
+        yield
+    finally:
+        field.auto_now_add = auto_now_add
+
+
+class Command(BaseCommand):
+    help = (
+        'Gera dados sintéticos em volume (marcas, categorias, fornecedores, produtos, entradas e saídas) '
+        'com bulk_create, espalhados pelos últimos --days dias. O estoque de cada produto fica coerente '
+        '(entradas - saídas) e as rollups de relatórios são recalculadas uma vez ao final. Os dados não '
+        'entram no feed de sincronização: clientes devem sincronizar tudo de novo depois da geração.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--brands', type=int, default=200)
+        parser.add_argument('--categories', type=int, default=50)
+        parser.add_argument('--suppliers', type=int, default=500)
+        parser.add_argument('--products', type=int, default=100_000)
+        parser.add_argument('--inflows', type=int, default=1_000_000)
+        parser.add_argument('--outflows', type=int, default=5_000_000)
+        parser.add_argument('--days', type=int, default=365, help='Período, em dias até hoje, das movimentações.')
+        parser.add_argument('--batch-size', type=int, default=10_000, help='Linhas por INSERT.')
+        parser.add_argument('--seed', type=int, default=42, help='Semente do gerador, para repetir o mesmo volume.')
+
+    def handle(self, *args, **options):
+        counts = [options[name] for name in ('brands', 'categories', 'suppliers', 'products', 'days', 'batch_size')]
+        if min(counts) < 1 or options['inflows'] < 0 or options['outflows'] < 0:
+            raise CommandError('As quantidades devem ser positivas (entradas e saídas podem ser zero).')
+
+        self.random = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.now = timezone.now()
+        self.period = timedelta(days=options['days'])
+        self.inserted = {}
+        started = time.monotonic()
+
+        brand_ids = self.create_named(Brand, 'Marca', options['brands'])
+        category_ids = self.create_named(Category, 'Categoria', options['categories'])
+        supplier_ids = self.create_named(Supplier, 'Fornecedor', options['suppliers'])
+        product_ids = self.create_products(options['products'], brand_ids, category_ids)
+
+        stock = dict.fromkeys(product_ids, 0)
+        self.create_inflows(options['inflows'], product_ids, supplier_ids, stock)
+        self.create_outflows(options['outflows'], product_ids, stock)
+        self.update_stock(stock)
+        for label, inserted in self.inserted.items():
+            self.stdout.write(self.style.NOTICE(f'{label}: {inserted} linhas inseridas.'))
+
+        self.stdout.write(self.style.NOTICE('Recalculando as rollups...'))
+        call_command('rebuild_rollups', stdout=self.stdout)
+        invalidate(PRODUCT_METRICS, SALES_METRICS, CATALOG_CHOICES)
+
+        self.stdout.write(self.style.SUCCESS(f'Dados sintéticos gerados em {time.monotonic() - started:.0f}s.'))
+
+    def random_datetime(self):
+        return self.now - self.period * self.random.random()
+
+    def insert(self, model, objects, label, total, dated=False):
+        # bulk_create não dispara signals: nada vai para o feed de sincronização nem para as rollups,
+        # que são recalculadas de uma vez ao final.
+        with explicit_created_at(model) if dated else nullcontext():
+            model.objects.bulk_create(objects, batch_size=self.batch_size)
+        self.inserted[label] = self.inserted.get(label, 0) + len(objects)
+        if self.inserted[label] % (self.batch_size * 10) < len(objects):
+            self.stdout.write(self.style.NOTICE(f'{label}: {self.inserted[label]}/{total}'))
+
+    def create_named(self, model, prefix, count):
+        run = self.now.strftime('%Y%m%d%H%M%S')
+        model.objects.bulk_create(
+            [model(name=f'{prefix} {run}-{index}', description=f'{prefix} sintética') for index in range(count)],
+            batch_size=self.batch_size,
+        )
+        return list(model.objects.filter(name__startswith=f'{prefix} {run}-').values_list('pk', flat=True))
+
+    def create_products(self, count, brand_ids, category_ids):
+        run = self.now.strftime('%Y%m%d%H%M%S')
+        for start in range(0, count, self.batch_size):
+            products = []
+            for index in range(start, min(start + self.batch_size, count)):
+                cost_price = Decimal(self.random.randint(100, 100_000)) / 100
+                products.append(Product(
+                    title=f'Produto {run}-{index}',
+                    brand_id=self.random.choice(brand_ids),
+                    category_id=self.random.choice(category_ids),
+                    serie_number=f'SN-{run}-{index}',
+                    cost_price=cost_price,
+                    selling_price=(cost_price * Decimal('1.35')).quantize(Decimal('0.01')),
+                    quantity=0,
+                ))
+            self.insert(Product, products, 'Produtos', count)
+        return list(Product.objects.filter(title__startswith=f'Produto {run}-').values_list('pk', flat=True))
+
+    def create_inflows(self, count, product_ids, supplier_ids, stock):
+        for start in range(0, count, self.batch_size):
+            inflows = []
+            for _ in range(min(self.batch_size, count - start)):
+                product_id = self.random.choice(product_ids)
+                quantity = self.random.randint(10, 200)
+                stock[product_id] += quantity
+                inflows.append(Inflow(
+                    product_id=product_id,
+                    supplier_id=self.random.choice(supplier_ids),
+                    quantity=quantity,
+                    description='Entrada sintética',
+                    created_at=self.random_datetime(),
+                ))
+            self.insert(Inflow, inflows, 'Entradas', count, dated=True)
+
+    def create_outflows(self, count, product_ids, stock):
+        # Produtos populares concentram as vendas (distribuição aproximada de Pareto).
+        cum_weights = list(accumulate(1 / (rank + 1) for rank in range(len(product_ids))))
+        for start in range(0, count, self.batch_size):
+            outflows = []
+            size = min(self.batch_size, count - start)
+            for product_id in self.random.choices(product_ids, cum_weights=cum_weights, k=size):
+                quantity = min(self.random.randint(1, 5), stock[product_id])
+                if not quantity:
+                    continue
+                stock[product_id] -= quantity
+                outflows.append(Outflow(
+                    product_id=product_id,
+                    quantity=quantity,
+                    description='Saída sintética',
+                    created_at=self.random_datetime(),
+                ))
+            self.insert(Outflow, outflows, 'Saídas', count, dated=True)
+
+    def update_stock(self, stock):
+        now = timezone.now()
+        products = [Product(pk=product_id, quantity=quantity, updated_at=now) for product_id, quantity in stock.items()]
+        Product.objects.bulk_update(products, ['quantity', 'updated_at'], batch_size=1000)
+        self.stdout.write(self.style.NOTICE(f'Estoque atualizado para {len(products)} produtos.'))
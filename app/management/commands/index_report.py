@@ -0,0 +1,176 @@
+import json
+from datetime import timedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Sum
+from django.utils import timezone
+from app.pagination import ApiCursorPagination
+from brands.views import BrandCreateListAPIView
+from categories.views import CategoryCreateListAPIView
+from inflows.models import Inflow
+from inflows.views import InflowCreateListAPIView, InflowListView
+from outflows.models import Outflow
+from outflows.views import OutflowCreateListAPIView, OutflowListView
+from products.models import Product
+from products.views import ProductCreateListAPIView, ProductListView
+from reports.models import DailyProductSales
+from suppliers.views import SupplierCreateListAPIView
+from sync.models import Change
+
+
+# Nós do PostgreSQL que leem todas as linhas dos filhos antes de devolver a primeira: abaixo
+# deles, um LIMIT acima não encurta a varredura.
+BLOCKING_NODES = ('Sort', 'Aggregate', 'Hash', 'Materialize', 'WindowAgg')
+
+# Listagens das APIs: sem filtros, seguem a ordem padrão do ApiCursorPagination.
+API_LIST_VIEWS = (
+    ('brand', BrandCreateListAPIView),
+    ('category', CategoryCreateListAPIView),
+    ('supplier', SupplierCreateListAPIView),
+    ('product', ProductCreateListAPIView),
+    ('inflow', InflowCreateListAPIView),
+    ('outflow', OutflowCreateListAPIView),
+)
+
+SCAN_LABELS = {'seq': 'varredura sequencial', 'index': 'varredura completa de índice'}
+
+
+class Command(BaseCommand):
+    help = (
+        'Roda EXPLAIN nas consultas principais das listagens, APIs, métricas, exportações e do feed '
+        'de alterações, com valores tirados do banco atual, e aponta, em tabelas com mais de '
+        '--threshold linhas, varreduras sequenciais e varreduras de índice sem condição (que só '
+        'usam o índice pela ordem) ou com mais de --max-rows linhas estimadas. Exportações completas '
+        'podem varrer a tabela.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threshold', type=int, default=10_000,
+                            help='Tabelas com mais linhas que isso não deveriam ser varridas por inteiro.')
+        parser.add_argument('--max-rows', type=int, default=50_000,
+                            help='Varreduras de índice sem LIMIT com mais linhas estimadas que isso são apontadas.')
+        parser.add_argument('--plans', action='store_true', help='Mostra o plano completo de cada consulta.')
+
+    def handle(self, *args, **options):
+        if connection.vendor not in ('postgresql', 'sqlite'):
+            raise CommandError(f'Banco {connection.vendor} não suportado: use PostgreSQL ou SQLite.')
+        self.threshold = options['threshold']
+        self.max_rows = options['max_rows']
+        self.table_sizes = {}
+
+        flagged = 0
+        for name, queryset, full_scan in self.queries():
+            plan, scans = self.explain(queryset)
+            large = [(table, kind) for table, kind in scans if self.table_size(table) > self.threshold]
+            if large and not full_scan:
+                flagged += 1
+                tables = ', '.join(
+                    f'{SCAN_LABELS[kind]} em {table} (~{self.table_size(table)} linhas)' for table, kind in large
+                )
+                self.stdout.write(self.style.ERROR(f'{name}: {tables}'))
+            else:
+                self.stdout.write(self.style.SUCCESS(f'{name}: ok'))
+            if options['plans']:
+                self.stdout.write(plan)
+
+        if flagged:
+            raise CommandError(f'{flagged} consulta(s) com varredura completa em tabelas grandes.')
+
+    def queries(self):
+        """(nome, queryset, varredura completa esperada) com o mesmo formato das consultas reais."""
+        product = Product.objects.order_by('-pk').first()
+        product_id = product.pk if product else 0
+        title = product.title[:5] if product else 'a'
+        serie_number = product.serie_number if product else ''
+        since = timezone.now() - timedelta(days=1)
+        page = ApiCursorPagination.page_size + 1
+        # Sem pg_trgm (SQLite), a busca por parte do título não tem índice e varre a tabela.
+        title_scan = connection.vendor == 'sqlite'
+
+        for label, view in API_LIST_VIEWS:
+            yield f'{label}_api', view.queryset.order_by(*ApiCursorPagination.ordering)[:page], False
+
+        products = ProductListView.queryset
+        yield 'product_list', products.order_by('title')[:10], False
+        yield 'product_list:title', ProductListView.filter_queryset(products, {'title': title})[:10], title_scan
+        yield 'product_list:serie_number', ProductListView.filter_queryset(
+            products, {'serie_number': serie_number})[:10], False
+        yield 'product_api:updated_at', Product.objects.filter(updated_at__gt=since).order_by('updated_at', 'id')[:page], False
+        yield 'product_export', products.order_by('title'), True
+
+        for label, model, view in (('inflow', Inflow, InflowListView), ('outflow', Outflow, OutflowListView)):
+            movements = view.queryset
+            middle = model.objects.order_by('-created_at', '-id').values_list('created_at', flat=True)[
+                model.objects.count() // 2:].first() or since
+            yield f'{label}_list', movements.order_by('-created_at', '-id')[:11], False
+            yield f'{label}_list:cursor', movements.filter(created_at__lt=middle).order_by('-created_at', '-id')[:11], False
+            yield f'{label}_list:product', view.filter_queryset(
+                movements, {'product': title}).order_by('-created_at', '-id')[:11], title_scan
+            yield f'{label}_api:product', model.objects.filter(product_id=product_id).order_by('-created_at', '-id')[:page], False
+            yield f'{label}_api:period', model.objects.filter(
+                created_at__gte=since, created_at__lt=timezone.now()).order_by('-created_at', '-id')[:page], False
+            yield f'{label}_api:updated_at', model.objects.filter(updated_at__gt=since).order_by('updated_at', 'id')[:page], False
+            yield f'{label}_export', movements.order_by('-created_at'), True
+
+        yield 'metrics:daily_sales', DailyProductSales.objects.filter(
+            date__gte=timezone.localdate() - timedelta(days=30)).values('date').annotate(total=Sum('quantity')).order_by(), False
+        yield 'change_feed', Change.objects.filter(id__gt=0).order_by('id')[:501], False
+
+    def explain(self, queryset):
+        """Plano da consulta em texto e as varreduras completas, como pares (tabela, 'seq' ou 'index')."""
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+                plan = cursor.fetchone()[0]
+                plan = json.loads(plan) if isinstance(plan, str) else plan
+                return json.dumps(plan, indent=2), list(self.full_scans(plan[0]['Plan']))
+
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            details = [row[3] for row in cursor.fetchall()]
+        # No SQLite, "SCAN tabela" lê a tabela inteira e "SCAN tabela USING INDEX" lê o índice inteiro;
+        # "SEARCH" usa uma condição no índice. Como o plano não mostra o LIMIT nem os filtros, a leitura
+        # do índice só pela ordem é aceita quando a consulta tem LIMIT e nenhum filtro.
+        ordered_page = queryset.query.high_mark is not None and not queryset.query.where
+        scans = []
+        for detail in details:
+            if detail.startswith('SCAN '):
+                if 'INDEX' not in detail:
+                    scans.append((detail.split()[1], 'seq'))
+                elif not ordered_page:
+                    scans.append((detail.split()[1], 'index'))
+        return '\n'.join(details), scans
+
+    def full_scans(self, node, limited=False):
+        kind = node['Node Type']
+        if kind == 'Seq Scan':
+            yield node['Relation Name'], 'seq'
+        elif kind in ('Index Scan', 'Index Only Scan', 'Bitmap Heap Scan') and self.full_index_scan(node, limited):
+            yield node['Relation Name'], 'index'
+        if kind == 'Limit':
+            limited = True
+        elif kind in BLOCKING_NODES:
+            limited = False
+        for child in node.get('Plans', ()):
+            yield from self.full_scans(child, limited)
+
+    def full_index_scan(self, node, limited):
+        if 'Index Cond' not in node and node['Node Type'] != 'Bitmap Heap Scan':
+            # Índice usado só pela ordem: aceitável sob um LIMIT, desde que nenhuma linha seja
+            # descartada por filtro (ex.: cursor com as colunas na ordem errada do índice).
+            return not limited or 'Filter' in node
+        return not limited and node['Plan Rows'] > self.max_rows
+
+    def table_size(self, table):
+        if table not in self.table_sizes:
+            with connection.cursor() as cursor:
+                if connection.vendor == 'postgresql':
+                    # Estatística do planner: evita COUNT(*) em tabelas grandes.
+                    cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(%s)', [table])
+                    row = cursor.fetchone()
+                    size = row[0] if row else 0
+                else:
+                    cursor.execute(f'SELECT COUNT(*) FROM {connection.ops.quote_name(table)}')
+                    size = cursor.fetchone()[0]
+            self.table_sizes[table] = max(size, 0)
+        return self.table_sizes[table]
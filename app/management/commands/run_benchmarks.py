@@ -0,0 +1,278 @@
+import csv
+import fnmatch
+import json
+import os
+import platform
+import statistics
+import tempfile
+import time
+import tracemalloc
+from io import StringIO
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client, override_settings
+from django.urls import resolve, reverse
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import AccessToken
+from app.middleware import QueryRecorder, current_recorder
+from app.pagination import encode_cursor
+from brands.models import Brand
+from categories.models import Category
+from inflows.models import Inflow
+from outflows.models import Outflow
+from products.models import Product
+from suppliers.models import Supplier
+
+
+LIST_ROUTES = (
+    ('brand_list', Brand),
+    ('category_list', Category),
+    ('supplier_list', Supplier),
+    ('product_list', Product),
+)
+CURSOR_ROUTES = (
+    ('inflow_list', Inflow),
+    ('outflow_list', Outflow),
+)
+EXPORT_APPS = (
+    ('brand', Brand),
+    ('category', Category),
+    ('supplier', Supplier),
+    ('product', Product),
+    ('inflow', Inflow),
+    ('outflow', Outflow),
+)
+
+# Cada cenário é medido com o cache vazio antes de cada execução (frio) e já preenchido (quente).
+CACHE_MODES = (
+    ('cold', 'frio', True),
+    ('warm', 'quente', False),
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Mede latência, consultas SQL e pico de memória do dashboard e seus widgets, das listagens em páginas profundas, '
+        'das exportações, dos importadores e das APIs, sobre os dados atuais do banco (ver generate_fake_data). '
+        'Cada cenário é medido com o cache frio e quente. Grava o resultado em JSON e, com --compare, aponta '
+        'regressões nos dois modos em relação a uma linha de base. Tudo roda em uma transação desfeita ao final, '
+        'com cache isolado.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default='benchmark.json', help='Arquivo JSON com os resultados.')
+        parser.add_argument('--compare', help='JSON de uma execução anterior (linha de base) para comparar.')
+        parser.add_argument('--tolerance', type=float, default=0.2,
+                            help='Piora relativa de latência/memória tolerada no --compare (0.2 = 20%%).')
+        parser.add_argument('--repeat', type=int, default=3,
+                            help='Execuções medidas por cenário em cada modo de cache (após o aquecimento).')
+        parser.add_argument('--only', action='append', default=[],
+                            help='Roda só os cenários que casam com o padrão (ex.: "export:*"). Pode repetir.')
+        parser.add_argument('--skip', action='append', default=[], help='Ignora os cenários que casam com o padrão.')
+        parser.add_argument('--import-rows', type=int, default=10_000, help='Linhas dos CSVs usados nos importadores.')
+
+    def handle(self, *args, **options):
+        if options['repeat'] < 1 or options['import_rows'] < 1:
+            raise CommandError('--repeat e --import-rows devem ser maiores que zero.')
+        self.options = options
+
+        # Sem amostragem no RequestMetricsMiddleware: o QueryRecorder da requisição seria o dele, e as
+        # consultas feitas nas threads do dashboard não chegariam ao do benchmark.
+        with override_settings(
+            CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+            ALLOWED_HOSTS=['testserver'],
+            METRICS_SAMPLE_RATE=0,
+        ):
+            with transaction.atomic():
+                results = self.run_scenarios()
+                transaction.set_rollback(True)
+
+        report = {
+            'created_at': timezone.now().isoformat(),
+            'database': connection.vendor,
+            'python': platform.python_version(),
+            'rows': {model.__name__: model.objects.count() for _, model in EXPORT_APPS},
+            'results': results,
+        }
+        with open(options['output'], 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2, ensure_ascii=False)
+        self.stdout.write(self.style.SUCCESS(f'Resultados gravados em {options["output"]}.'))
+
+        if options['compare']:
+            regressions = self.compare(options['compare'], results)
+            if regressions:
+                raise CommandError(f'{regressions} regressão(ões) em relação a {options["compare"]}.')
+
+    def selected(self, name):
+        if self.options['only'] and not any(fnmatch.fnmatch(name, pattern) for pattern in self.options['only']):
+            return False
+        return not any(fnmatch.fnmatch(name, pattern) for pattern in self.options['skip'])
+
+    def scenarios(self):
+        """Gera (nome, função) de cada cenário; as URLs são montadas sobre os dados atuais."""
+        user = User.objects.create_superuser('benchmark', password=None)
+        pages = Client()
+        pages.force_login(user)
+        api = Client(headers={'Authorization': f'Bearer {AccessToken.for_user(user)}'})
+
+        yield 'home', lambda: self.get(pages, reverse('home'))
+        for widget in ('product_metrics', 'sales_metrics', 'products_by_category', 'products_by_brand', 'daily_sales'):
+            yield f'widget:{widget}', lambda widget=widget: self.get(pages, reverse(f'dashboard_{widget}'))
+        yield 'dashboard', lambda: self.get(pages, reverse('dashboard'))
+        yield 'widget:daily_sales:365d', lambda: self.get(pages, reverse('dashboard_daily_sales') + '?days=365')
+
+        for route, model in LIST_ROUTES:
+            per_page = resolve(reverse(route)).func.view_class.paginate_by
+            last_page = max(1, -(-model.objects.count() // per_page))
+            yield f'list:{route}:first', lambda route=route: self.get(pages, reverse(route))
+            yield f'list:{route}:last', lambda route=route, page=last_page: self.get(pages, f'{reverse(route)}?page={page}')
+
+        for route, model in CURSOR_ROUTES:
+            yield f'list:{route}:first', lambda route=route: self.get(pages, reverse(route))
+            # Cursor apontando para o meio do histórico: o equivalente a uma página profunda.
+            middle = model.objects.order_by('-created_at', '-id')[model.objects.count() // 2:].first()
+            if middle:
+                url = f'{reverse(route)}?cursor={encode_cursor(middle)}'
+                yield f'list:{route}:deep', lambda url=url: self.get(pages, url)
+
+        for name, _ in EXPORT_APPS:
+            yield f'export:{name}:csv', lambda name=name: self.get(pages, reverse(f'{name}_csv_export'))
+            yield f'export:{name}:xlsx', lambda name=name: self.get(pages, reverse(f'{name}_excel_export'))
+
+        for name, _ in EXPORT_APPS:
+            yield f'api:{name}', lambda name=name: self.get(api, reverse(f'{name}_create_list_api_view'))
+
+        files = self.write_import_files()
+        if files:
+            inflows_file, outflows_file = files
+            yield 'import:inflows', lambda: self.run_command('import_inflows', inflows_file)
+            yield 'import:inflows:bulk', lambda: self.run_command('import_inflows', inflows_file, '--bulk')
+            yield 'import:outflows', lambda: self.run_command('import_outflows', outflows_file, '--restart')
+
+    def run_scenarios(self):
+        results = {}
+        self.temporary_files = []
+        try:
+            for name, scenario in self.scenarios():
+                if not self.selected(name):
+                    continue
+                results[name] = self.measure(scenario)
+                self.stdout.write(f'{name}: ' + '; '.join(
+                    f'{label} {results[name][mode]["latency_ms"]["median"]:.1f} ms, '
+                    f'{results[name][mode]["queries"]} consultas, pico de {results[name][mode]["peak_memory_kb"]} KB'
+                    for mode, label, _ in CACHE_MODES
+                ))
+        finally:
+            for path in self.temporary_files:
+                os.remove(path)
+        return results
+
+    def measure(self, scenario):
+        # Cada execução roda em um savepoint desfeito: importadores não acumulam dados entre execuções.
+        # O QueryRecorder (via current_recorder, que também alcança as threads do dashboard) fica
+        # dentro do savepoint para não contar os comandos SAVEPOINT/ROLLBACK. O rollback não limpa o
+        # cache: no modo frio, ele é esvaziado antes de cada execução.
+        def run(cold, recorder=None):
+            if cold:
+                cache.clear()
+            with transaction.atomic():
+                token = current_recorder.set(recorder or QueryRecorder())
+                try:
+                    started = time.perf_counter()
+                    scenario()
+                    elapsed = (time.perf_counter() - started) * 1000
+                finally:
+                    current_recorder.reset(token)
+                transaction.set_rollback(True)
+            return elapsed
+
+        result = {}
+        for mode, _, cold in CACHE_MODES:
+            run(cold)  # aquecimento; no modo quente, também preenche o cache
+            latencies = [run(cold) for _ in range(self.options['repeat'])]
+
+            # Consultas e memória em uma execução à parte: o tracemalloc deixa o código bem mais lento.
+            recorder = QueryRecorder()
+            tracemalloc.start()
+            try:
+                run(cold, recorder)
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+            result[mode] = {
+                'latency_ms': {
+                    'min': round(min(latencies), 2),
+                    'median': round(statistics.median(latencies), 2),
+                    'max': round(max(latencies), 2),
+                },
+                'queries': recorder.count,
+                'db_ms': round(recorder.time * 1000, 2),
+                'peak_memory_kb': peak // 1024,
+            }
+        return result
+
+    def get(self, client, url):
+        response = client.get(url)
+        if response.status_code != 200:
+            raise CommandError(f'{url} respondeu {response.status_code}.')
+        if response.streaming:
+            for _ in response.streaming_content:
+                pass
+
+    def run_command(self, *args):
+        call_command(*args, stdout=StringIO(), stderr=StringIO())
+
+    def write_import_files(self):
+        """CSVs de entradas e saídas com produtos e fornecedores existentes, ou None sem dados."""
+        rows = self.options['import_rows']
+        titles = list(Product.objects.order_by('?').values_list('title', flat=True)[:1000])
+        suppliers = list(Supplier.objects.values_list('name', flat=True)[:100])
+        if not titles or not suppliers:
+            return None
+
+        files = []
+        for header, make_row in (
+            (['produto', 'fornecedor', 'descricao', 'quantidade'],
+             lambda index: [titles[index % len(titles)], suppliers[index % len(suppliers)], f'benchmark {index}', 5]),
+            (['produto', 'descricao', 'quantidade'],
+             lambda index: [titles[index % len(titles)], f'benchmark {index}', 1]),
+        ):
+            file = tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False, encoding='utf-8', newline='')
+            with file:
+                writer = csv.writer(file, delimiter=';')
+                writer.writerow(header)
+                writer.writerows(make_row(index) for index in range(rows))
+            self.temporary_files.append(file.name)
+            files.append(file.name)
+        return files
+
+    def compare(self, baseline_path, results):
+        with open(baseline_path, encoding='utf-8') as file:
+            baseline = json.load(file)['results']
+
+        tolerance = 1 + self.options['tolerance']
+        regressions = 0
+        for name, result in results.items():
+            problems = []
+            for mode, label, _ in CACHE_MODES:
+                # Linhas de base antigas, sem os modos de cache, não são comparadas.
+                previous = baseline.get(name, {}).get(mode)
+                if previous is None:
+                    continue
+                current = result[mode]
+                if current['queries'] > previous['queries']:
+                    problems.append(f'{label}: consultas {previous["queries"]} -> {current["queries"]}')
+                if current['latency_ms']['median'] > previous['latency_ms']['median'] * tolerance:
+                    problems.append(
+                        f'{label}: latência {previous["latency_ms"]["median"]} -> {current["latency_ms"]["median"]} ms'
+                    )
+                if current['peak_memory_kb'] > previous['peak_memory_kb'] * tolerance:
+                    problems.append(f'{label}: memória {previous["peak_memory_kb"]} -> {current["peak_memory_kb"]} KB')
+            if problems:
+                regressions += 1
+                self.stdout.write(self.style.ERROR(f'{name}: ' + ', '.join(problems)))
+        return regressions
@@ -1,120 +1,250 @@
-from django.db.models import Sum, F
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import timedelta
+from decimal import Decimal
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.db.models import Count, DecimalField, Sum, F
 from django.utils import timezone
-from django.utils.formats import number_format
-from django.core.cache import cache
 
-from brands.models import Brand
-from categories.models import Category
-from products.models import Product
+from app.cache import PRODUCT_METRICS, SALES_METRICS
 from outflows.models import Outflow
+from products.models import Product
+from reports.models import DailyProductSales
+
+
+logger = logging.getLogger(__name__)
+
+
+# Mesma precisão dos campos de preço de Product, com folga para somas de milhões de linhas.
+MONEY_FIELD = DecimalField(max_digits=30, decimal_places=2)
+
+# Janelas (em dias) disponíveis para as séries diárias de vendas do dashboard.
+SALES_WINDOWS = (7, 30, 90, 365)
+DEFAULT_SALES_WINDOW = 7
+
+# Grupos exibidos nos gráficos por categoria/marca; os demais são somados em "Outros".
+TOP_GROUPS = 10
+OTHERS_LABEL = 'Outros'
+
+
+@dataclass(frozen=True)
+class ProductMetrics:
+    """Totais do estoque atual, sem formatação (formatados no template)."""
+    total_cost_price: Decimal
+    total_selling_price: Decimal
+    total_quantity: int
+
+    @property
+    def total_profit(self):
+        return self.total_selling_price - self.total_cost_price
+
+    def as_dict(self):
+        return {
+            'total_quantity': self.total_quantity,
+            'total_cost_price': round(float(self.total_cost_price), 2),
+            'total_selling_price': round(float(self.total_selling_price), 2),
+            'total_profit': round(float(self.total_profit), 2),
+        }
+
+
+@dataclass(frozen=True)
+class SalesMetrics:
+    """Totais de vendas (Outflow), sem formatação (formatados no template)."""
+    total_sales: int
+    total_products_sold: int
+    total_sales_value: Decimal
+    total_sales_cost: Decimal
+
+    @property
+    def total_sales_profit(self):
+        return self.total_sales_value - self.total_sales_cost
+
+    def as_dict(self):
+        return {
+            'total_sales': self.total_sales,
+            'total_products_sold': self.total_products_sold,
+            'total_sales_value': round(float(self.total_sales_value), 2),
+            'total_sales_profit': round(float(self.total_sales_profit), 2),
+        }
+
+
+def _money_sum(price_field, quantity_field):
+    """Sum(preço * quantidade) calculado no banco, com saída Decimal."""
+    return Sum(F(price_field) * F(quantity_field), output_field=MONEY_FIELD, default=Decimal('0'))
+
+
+def _compute_product_metrics():
+    totals = Product.objects.aggregate(
+        total_cost_price=_money_sum('cost_price', 'quantity'),
+        total_selling_price=_money_sum('selling_price', 'quantity'),
+        total_quantity=Sum('quantity', default=0),
+    )
+    return ProductMetrics(**totals)
 
 
 def get_product_metrics():
     """Métricas gerais de produtos."""
-    data = cache.get('product_metrics')
-
-    if data is None:
-        products = Product.objects.all()
-        total_cost_price = sum(p.cost_price * p.quantity for p in products)
-        total_selling_price = sum(p.selling_price * p.quantity for p in products)
-        total_quantity = sum(p.quantity for p in products)
-        total_profit = total_selling_price - total_cost_price
-
-        data = dict(
-            total_cost_price=number_format(total_cost_price, decimal_pos=2, force_grouping=True),
-            total_selling_price=number_format(total_selling_price, decimal_pos=2, force_grouping=True),
-            total_quantity=total_quantity,
-            total_profit=number_format(total_profit, decimal_pos=2, force_grouping=True),
+    return PRODUCT_METRICS.get_or_compute(_compute_product_metrics)
+
+
+def _compute_sales_metrics():
+    # Uma única consulta agregada sobre linhas já agregadas por produto e dia.
+    totals = DailyProductSales.objects.aggregate(
+        total_sales=Sum('sales_count', default=0),
+        total_products_sold=Sum('quantity', default=0),
+        total_sales_value=_money_sum('product__selling_price', 'quantity'),
+        total_sales_cost=_money_sum('product__cost_price', 'quantity'),
+    )
+    if not totals['total_sales'] and Outflow.objects.exists():
+        # Rollups vazias com saídas gravadas: o histórico anterior às rollups não foi importado.
+        logger.warning(
+            'Há saídas registradas, mas as rollups de vendas estão vazias: as métricas de vendas '
+            'aparecem zeradas. Rode "manage.py rebuild_rollups".'
         )
-        cache.set('product_metrics', data)
-
-    return data
+    return SalesMetrics(**totals)
 
 
 def get_sales_metrics():
-    """Métricas gerais de vendas."""
-    data = cache.get('sales_metrics')
+    """Métricas gerais de vendas, lidas das rollups diárias (reports.DailyProductSales)."""
+    return SALES_METRICS.get_or_compute(_compute_sales_metrics)
 
-    if data is None:
-        # total_sales = quantidade de registros de vendas (Outflow) -> "Quantidade de Vendas"
-        total_sales = Outflow.objects.count()
 
-        # total_products_sold = soma total de produtos vendidos -> "Produtos Vendidos"
-        total_products_sold = Outflow.objects.aggregate(
-            total_products_sold=Sum('quantity')
-        )['total_products_sold'] or 0
+def get_sales_window(value):
+    """Converte o parâmetro de janela (dias) para um valor suportado, com fallback para o padrão."""
+    try:
+        days = int(value)
+    except (TypeError, ValueError):
+        return DEFAULT_SALES_WINDOW
+    return days if days in SALES_WINDOWS else DEFAULT_SALES_WINDOW
 
-        # Para evitar muitas consultas, use select_related:
-        outflows = Outflow.objects.select_related('product').only(
-            'quantity', 'product__selling_price', 'product__cost_price'
-        )
 
-        total_sales_value = sum(o.quantity * o.product.selling_price for o in outflows)
-        total_sales_cost = sum(o.quantity * o.product.cost_price for o in outflows)
-        total_sales_profit = total_sales_value - total_sales_cost
+def _get_daily_sales_series(days, total):
+    """
+    Agrega as vendas por dia em uma única consulta agrupada, nos últimos `days` dias.
 
-        # Formata os valores com separador de milhar onde necessário:
-        data = dict(
-            total_sales=number_format(total_sales, decimal_pos=0, force_grouping=True),
-            total_products_sold=number_format(total_products_sold, decimal_pos=0, force_grouping=True),
-            total_sales_value=number_format(total_sales_value, decimal_pos=2, force_grouping=True),
-            total_sales_profit=number_format(total_sales_profit, decimal_pos=2, force_grouping=True),
-        )
+    Lê reports.DailyProductSales (uma linha por produto e dia, com índice em date) em vez de
+    varrer Outflow. Dias sem vendas são preenchidos com zero.
+    """
+    today = timezone.localdate()
+    first_day = today - timedelta(days=days - 1)
 
-        cache.set('sales_metrics', data)
+    rows = (
+        DailyProductSales.objects
+                         .filter(date__gte=first_day, date__lte=today)
+                         .values('date')
+                         .annotate(total=total)
+                         .order_by()
+    )
+    totals = {row['date']: row['total'] for row in rows}
 
-    return data
+    dates = [first_day + timedelta(days=i) for i in range(days)]
+    return [str(date) for date in dates], [totals.get(date, 0) for date in dates]
 
 
-def get_daily_sales_data():
-    """Retorna os valores de vendas diárias dos últimos 7 dias."""
-    today = timezone.now().date()
-    dates = [str(today - timezone.timedelta(days=i)) for i in range(6, -1, -1)]
-    values = []
+def get_daily_sales_data(days=DEFAULT_SALES_WINDOW):
+    """Retorna os valores de vendas diárias dos últimos `days` dias."""
+    dates, values = _get_daily_sales_series(days, _money_sum('product__selling_price', 'quantity'))
+    return dict(dates=dates, values=[float(value) for value in values])
 
-    for date in dates:
-        sales_total = (
-            Outflow.objects
-                   .filter(created_at__date=date)
-                   .aggregate(total_sales=Sum(F('product__selling_price') * F('quantity')))
-                   .get('total_sales') or 0
-        )
-        values.append(float(sales_total))
 
+def get_daily_sales_quantity_data(days=DEFAULT_SALES_WINDOW):
+    """Retorna a quantidade de vendas diárias (número de saídas) dos últimos `days` dias."""
+    dates, values = _get_daily_sales_series(days, Sum('sales_count'))
     return dict(dates=dates, values=values)
 
 
-def get_daily_sales_quantity_data():
-    """Retorna a quantidade de vendas diárias (em unidades) dos últimos 7 dias."""
-    today = timezone.now().date()
-    dates = [str(today - timezone.timedelta(days=i)) for i in range(6, -1, -1)]
-    quantities = []
-
-    for date in dates:
-        sales_quantity = Outflow.objects.filter(created_at__date=date).count()
-        # Formata a quantidade com separador de milhar
-        formatted_quantity = number_format(sales_quantity, decimal_pos=0, force_grouping=True)
-        quantities.append(formatted_quantity)
-    return dict(dates=dates, values=quantities)
+def get_daily_sales_series(days=DEFAULT_SALES_WINDOW):
+    """Valor e quantidade de vendas diárias dos últimos `days` dias, em cache até a próxima venda."""
+    return SALES_METRICS.get_or_compute(
+        lambda: dict(value=get_daily_sales_data(days), quantity=get_daily_sales_quantity_data(days)),
+        'daily', days, timezone.localdate(),
+    )
+
+
+def _compute_products_by(field):
+    """
+    Produtos, quantidade em estoque e valor do estoque (preço de venda) por categoria ou marca,
+    em uma única consulta agrupada. Os TOP_GROUPS grupos com mais produtos vêm primeiro e o
+    restante é somado em OTHERS_LABEL; grupos sem produtos não aparecem.
+    """
+    totals = dict(
+        product_count=Count('id'),
+        stock_quantity=Sum('quantity', default=0),
+        stock_value=_money_sum('selling_price', 'quantity'),
+    )
+    rows = list(
+        Product.objects.values(f'{field}_id', f'{field}__name')
+                       .annotate(**totals)
+                       .order_by('-product_count', f'{field}__name')
+    )
+    groups = [
+        (row[f'{field}__name'], row['product_count'], row['stock_quantity'], row['stock_value'])
+        for row in rows[:TOP_GROUPS]
+    ]
+    others = rows[TOP_GROUPS:]
+    if others:
+        groups.append((
+            OTHERS_LABEL,
+            sum(row['product_count'] for row in others),
+            sum(row['stock_quantity'] for row in others),
+            sum((row['stock_value'] for row in others), Decimal('0')),
+        ))
+    return {
+        'labels': [group[0] for group in groups],
+        'products': [group[1] for group in groups],
+        'quantity': [group[2] for group in groups],
+        'value': [round(float(group[3]), 2) for group in groups],
+    }
 
 
 def get_graphic_product_category_metric():
-    """Retorna a contagem de produtos por categoria (para gráficos)."""
-    categories = Category.objects.all()
-    return {
-        category.name: Product.objects.filter(category=category).count()
-        for category in categories
-    }
+    """Produtos, estoque e valor por categoria (para gráficos), com as categorias menores em "Outros"."""
+    return PRODUCT_METRICS.get_or_compute(lambda: _compute_products_by('category'), 'by_category')
 
 
 def get_graphic_product_brand_metric():
-    """Retorna a contagem de produtos por marca (para gráficos)."""
-    brands = Brand.objects.all()
-    return {
-        brand.name: number_format(
-            Product.objects.filter(brand=brand).count(),
-            decimal_pos=0,
-            force_grouping=True
-        )
-        for brand in brands
-    }
+    """Produtos, estoque e valor por marca (para gráficos), com as marcas menores em "Outros"."""
+    return PRODUCT_METRICS.get_or_compute(lambda: _compute_products_by('brand'), 'by_brand')
+
+
+# Widgets do dashboard: nome -> função que recebe a janela de vendas (em dias) e retorna o JSON.
+DASHBOARD_WIDGETS = {
+    'product_metrics': lambda days: get_product_metrics().as_dict(),
+    'sales_metrics': lambda days: get_sales_metrics().as_dict(),
+    'products_by_category': lambda days: get_graphic_product_category_metric(),
+    'products_by_brand': lambda days: get_graphic_product_brand_metric(),
+    'daily_sales': get_daily_sales_series,
+}
+
+# Threads para calcular widgets em paralelo (aget_dashboard). O tamanho limita também quantas
+# conexões extras com o banco um dashboard pode abrir ao mesmo tempo.
+_executor = ThreadPoolExecutor(max_workers=settings.DASHBOARD_WORKERS, thread_name_prefix='dashboard')
+
+
+def _run_widget(name, days):
+    try:
+        return DASHBOARD_WIDGETS[name](days)
+    finally:
+        # Cada thread do _executor usa a própria conexão: fecha sempre, mesmo com CONN_MAX_AGE, para
+        # não deixar até DASHBOARD_WORKERS conexões ociosas por processo; com o pool do psycopg,
+        # fechar devolve a conexão ao pool.
+        connections.close_all()
+
+
+def get_dashboard(names, days=DEFAULT_SALES_WINDOW):
+    """Dados dos widgets `names`, calculados um depois do outro."""
+    return {name: DASHBOARD_WIDGETS[name](days) for name in names}
+
+
+async def aget_dashboard(names, days=DEFAULT_SALES_WINDOW):
+    """
+    Dados dos widgets `names`, calculados ao mesmo tempo em threads do _executor: com o cache
+    frio, o tempo total fica perto do widget mais lento em vez da soma de todos.
+    """
+    run_widget = sync_to_async(_run_widget, thread_sensitive=False, executor=_executor)
+    results = await asyncio.gather(*(run_widget(name, days) for name in names))
+    return dict(zip(names, results))
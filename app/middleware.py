@@ -0,0 +1,116 @@
+import contextvars
+import random
+import threading
+import time
+from collections import Counter
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from app import cache, instrumentation
+
+
+class QueryRecorder:
+    """execute_wrapper que conta as consultas e soma o tempo gasto nelas."""
+
+    def __init__(self):
+        self.count = 0
+        self.time = 0.0
+        # As consultas de uma requisição podem rodar em várias threads (ex.: widgets do dashboard).
+        self._lock = threading.Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self.count += 1
+                self.time += elapsed
+
+
+# QueryRecorder da requisição atual, ou None fora de uma requisição medida. Por ser um ContextVar,
+# acompanha o código que a requisição roda em outras threads via sync_to_async (views assíncronas,
+# metrics.aget_dashboard).
+current_recorder = contextvars.ContextVar('current_recorder', default=None)
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    execute_wrapper instalado em toda conexão (app.signals): repassa a consulta ao QueryRecorder
+    da requisição atual, se houver, qualquer que seja a thread dona da conexão.
+    """
+    recorder = current_recorder.get()
+    if recorder is None:
+        return execute(sql, params, many, context)
+    return recorder(execute, sql, params, many, context)
+
+
+class RequestMetricsMiddleware:
+    """
+    Registra consultas SQL, tempo de banco, eventos do cache e tempo total de cada requisição
+    amostrada (METRICS_SAMPLE_RATE), agrupados pelo nome da URL (ver app.instrumentation).
+
+    Deve ser o primeiro middleware, para incluir sessão e autenticação na medição. Funciona sob
+    WSGI e ASGI; consultas feitas em outras threads a partir da requisição (sync_to_async) também
+    entram, e o tempo de banco soma o de todas elas, podendo passar do tempo total. Consultas feitas
+    enquanto um StreamingHttpResponse é enviado (exportações) não são contadas.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = settings.METRICS_SAMPLE_RATE
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        recorder, cache_events, tokens = self.start()
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            self.finish(tokens)
+        self.record(request, response, recorder, cache_events, started)
+        return response
+
+    async def __acall__(self, request):
+        if random.random() >= self.sample_rate:
+            return await self.get_response(request)
+
+        recorder, cache_events, tokens = self.start()
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            self.finish(tokens)
+        self.record(request, response, recorder, cache_events, started)
+        return response
+
+    def start(self):
+        recorder = QueryRecorder()
+        cache_events = Counter()
+        tokens = (current_recorder.set(recorder), cache.request_events.set(cache_events))
+        return recorder, cache_events, tokens
+
+    def finish(self, tokens):
+        recorder_token, events_token = tokens
+        current_recorder.reset(recorder_token)
+        cache.request_events.reset(events_token)
+
+    def record(self, request, response, recorder, cache_events, started):
+        match = request.resolver_match
+        instrumentation.record(
+            route=match.view_name if match else 'unresolved',
+            duration=time.perf_counter() - started,
+            db_time=recorder.time,
+            queries=recorder.count,
+            status_code=response.status_code,
+            cache_events=cache_events,
+        )
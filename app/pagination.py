@@ -0,0 +1,144 @@
+"""
+Paginação por cursor (keyset) para as listagens de movimentações e para as APIs.
+
+Em vez de OFFSET, cada página começa depois da última linha da página anterior, identificada
+pelo par (created_at, id): o banco vai direto à posição certa, não importa quão longe na
+listagem o usuário esteja. Os links de próxima/anterior carregam essa posição num token opaco
+(?cursor=...), e o total exibido é uma estimativa, sem COUNT(*) sobre a tabela inteira.
+"""
+import base64
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from django.db import connection
+from django.db.models import Q
+from django.http import Http404
+from rest_framework.pagination import CursorPagination
+
+
+# Acima disso, listagens filtradas mostram "mais de N" em vez de contar tudo.
+COUNT_LIMIT = 10000
+
+
+def encode_cursor(obj, previous=False):
+    position = {'c': obj.created_at.isoformat(), 'i': obj.pk}
+    if previous:
+        position['p'] = 1
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    """Retorna (created_at, id, previous) de um token gerado por encode_cursor."""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        position = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(position['c']), int(position['i']), bool(position.get('p'))
+    except (ValueError, TypeError, KeyError):
+        raise Http404('Cursor inválido.')
+
+
+def estimate_count(queryset, filtered=False):
+    """
+    Total aproximado de linhas de `queryset`: retorna (total, limitado).
+
+    Sem filtros no PostgreSQL usa a estatística do planner (pg_class.reltuples), mantida pelo
+    autovacuum; com filtros conta no máximo COUNT_LIMIT linhas e `limitado` indica o corte.
+    """
+    if not filtered and connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(%s)',
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        # reltuples é -1 enquanto a tabela nunca foi analisada.
+        if row and row[0] >= 0:
+            return row[0], False
+    total = queryset.order_by()[:COUNT_LIMIT + 1].count()
+    return min(total, COUNT_LIMIT), total > COUNT_LIMIT
+
+
+@dataclass
+class CursorPage:
+    object_list: list
+    has_next: bool
+    has_previous: bool
+    count: int
+    count_limited: bool
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+
+    @property
+    def next_cursor(self):
+        return encode_cursor(self.object_list[-1]) if self.has_next and self.object_list else None
+
+    @property
+    def previous_cursor(self):
+        return encode_cursor(self.object_list[0], previous=True) if self.has_previous and self.object_list else None
+
+
+def paginate_by_cursor(queryset, token, page_size, filtered=False):
+    """Página de `queryset` em ordem decrescente de (created_at, id) a partir do cursor `token`."""
+    count, count_limited = estimate_count(queryset, filtered)
+    if not token:
+        rows = list(queryset.order_by('-created_at', '-id')[:page_size + 1])
+        return CursorPage(rows[:page_size], len(rows) > page_size, False, count, count_limited)
+
+    created_at, pk, previous = decode_cursor(token)
+    if previous:
+        # Página anterior: busca em ordem crescente a partir do cursor e inverte o resultado.
+        after = Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk)
+        rows = list(queryset.filter(after).order_by('created_at', 'id')[:page_size + 1])
+        has_previous = len(rows) > page_size
+        rows = rows[:page_size][::-1]
+        return CursorPage(rows, True, has_previous, count, count_limited)
+
+    before = Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+    rows = list(queryset.filter(before).order_by('-created_at', '-id')[:page_size + 1])
+    return CursorPage(rows[:page_size], len(rows) > page_size, True, count, count_limited)
+
+
+class CursorPaginationMixin:
+    """
+    Troca a paginação por OFFSET de um ListView pela paginação por cursor.
+
+    O tamanho da página continua vindo de paginate_by; a view informa em is_filtered()
+    se a listagem está filtrada, para a contagem estimada.
+    """
+    cursor_param = 'cursor'
+
+    def is_filtered(self):
+        return False
+
+    def paginate_queryset(self, queryset, page_size):
+        page = paginate_by_cursor(
+            queryset, self.request.GET.get(self.cursor_param), page_size, self.is_filtered(),
+        )
+        return None, page, page.object_list, page.has_other_pages()
+
+
+class ApiCursorPagination(CursorPagination):
+    """
+    Paginação padrão das APIs (REST_FRAMEWORK['DEFAULT_PAGINATION_CLASS']).
+
+    Lista do registro mais novo para o mais antigo. Na sincronização incremental
+    (?updated_at__gt=...) a ordem passa a ser crescente por updated_at, para que o cliente
+    percorra as alterações na ordem em que aconteceram e guarde o updated_at do último item.
+    """
+    ordering = ('-created_at', '-id')
+    sync_ordering = ('updated_at', 'id')
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+
+    def get_ordering(self, request, queryset, view):
+        if 'updated_at__gt' in request.query_params:
+            return self.sync_ordering
+        return self.ordering
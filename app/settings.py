@@ -1,5 +1,8 @@
+import os
 from datetime import timedelta
 from pathlib import Path
+from urllib.parse import urlsplit
+from django.core.exceptions import ImproperlyConfigured
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -30,6 +33,7 @@ INSTALLED_APPS = [
     'rest_framework',
     'rest_framework_simplejwt',
 
+    'app',
     'authentication',
 
     'brands',
@@ -38,6 +42,9 @@ INSTALLED_APPS = [
     'products',
     'inflows',
     'outflows',
+    'reports',
+    'exports',
+    'sync',
 
    
 ]
@@ -50,6 +57,7 @@ LOGOUT_REDIRECT_URL = '/login/'
 
 
 MIDDLEWARE = [
+    'app.middleware.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -83,20 +91,47 @@ WSGI_APPLICATION = 'app.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
+#
+# Conexões persistentes: cada thread reaproveita a conexão por SGE_DB_CONN_MAX_AGE segundos
+# (0 abre e fecha uma conexão por requisição) e, com SGE_DB_CONN_HEALTH_CHECKS, uma conexão
+# reaproveitada que caiu é descartada e reaberta antes do uso, em vez de falhar a requisição.
+#
+# SGE_DB_POOL=1 troca as conexões persistentes por um pool do psycopg 3 em cada processo
+# (requer o pacote "psycopg[binary,pool]" no lugar de psycopg2-binary): no máximo
+# SGE_DB_POOL_MAX_SIZE conexões por processo, e quem espera mais de SGE_DB_POOL_TIMEOUT segundos
+# por uma conexão recebe erro em vez de esgotar o max_connections do servidor. O tamanho e a
+# espera do pool aparecem em /metrics/.
+#
+# Dimensionamento: cada processo usa até (threads de requisição + SGE_DASHBOARD_WORKERS)
+# conexões ao mesmo tempo, pois o dashboard calcula os widgets em threads próprias. Use esse
+# valor como SGE_DB_POOL_MAX_SIZE e mantenha processos x SGE_DB_POOL_MAX_SIZE abaixo do
+# max_connections do PostgreSQL; sem o pool, as conexões persistentes seguem a mesma conta.
+DATABASE_POOL = os.environ.get('SGE_DB_POOL', '').lower() in ('1', 'true', 'yes')
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',
-        'NAME': 'sge',
-        'USER': 'postgres',
-        'PASSWORD': 'gold@0993',
-        'HOST': 'localhost',
-        'PORT': '5432',
+        'NAME': os.environ.get('SGE_DB_NAME', 'sge'),
+        'USER': os.environ.get('SGE_DB_USER', 'postgres'),
+        'PASSWORD': os.environ.get('SGE_DB_PASSWORD', 'gold@0993'),
+        'HOST': os.environ.get('SGE_DB_HOST', 'localhost'),
+        'PORT': os.environ.get('SGE_DB_PORT', '5432'),
+        # O pool do Django não aceita conexões persistentes: quem guarda as conexões é o pool.
+        'CONN_MAX_AGE': 0 if DATABASE_POOL else int(os.environ.get('SGE_DB_CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': os.environ.get('SGE_DB_CONN_HEALTH_CHECKS', 'true').lower() in ('1', 'true', 'yes'),
         'OPTIONS': {
             'client_encoding': 'UTF8',
         },
     }
 }
 
+if DATABASE_POOL:
+    DATABASES['default']['OPTIONS']['pool'] = {
+        'min_size': int(os.environ.get('SGE_DB_POOL_MIN_SIZE', 2)),
+        'max_size': int(os.environ.get('SGE_DB_POOL_MAX_SIZE', 10)),
+        'timeout': float(os.environ.get('SGE_DB_POOL_TIMEOUT', 10)),
+    }
+
 
 
 # Password validation
@@ -148,6 +183,10 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
         'rest_framework.permissions.DjangoModelPermissions',
     ),
+    'DEFAULT_PAGINATION_CLASS': 'app.pagination.ApiCursorPagination',
+    'DEFAULT_FILTER_BACKENDS': (
+        'app.filters.ApiFilterBackend',
+    ),
 }
 
 SIMPLE_JWT = {
@@ -155,14 +194,63 @@ SIMPLE_JWT = {
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7)
 }
 
-CACHES = {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-        'LOCATION': 'unique-snowflake',
+# Cache compartilhado entre processos, escolhido pela variável de ambiente SGE_CACHE_URL:
+#   redis://localhost:6379/0     -> Redis (requer o pacote redis)
+#   memcached://localhost:11211  -> memcached (requer o pacote pymemcache)
+#   file:///var/tmp/sge-cache    -> arquivos em disco (padrão: BASE_DIR/var/cache; só para
+#                                   desenvolvimento, pois add não é atômico entre processos)
+#   db://sge_cache               -> tabela no banco (requer `manage.py createcachetable`)
+#   locmem://                    -> memória de cada processo (não é compartilhado entre workers)
+CACHE_BACKENDS = {
+    'redis': 'django.core.cache.backends.redis.RedisCache',
+    'rediss': 'django.core.cache.backends.redis.RedisCache',
+    'memcached': 'django.core.cache.backends.memcached.PyMemcacheCache',
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+    'db': 'django.core.cache.backends.db.DatabaseCache',
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+}
+
+
+def cache_from_url(url):
+    parts = urlsplit(url)
+    if parts.scheme not in CACHE_BACKENDS:
+        raise ImproperlyConfigured(f'SGE_CACHE_URL com esquema não suportado: {url}')
+    if parts.scheme in ('redis', 'rediss'):
+        location = url
+    elif parts.scheme == 'file':
+        location = parts.path
+    else:
+        location = parts.netloc or parts.path.lstrip('/') or 'sge'
+    return {
+        'BACKEND': CACHE_BACKENDS[parts.scheme],
+        'LOCATION': location,
+        'KEY_PREFIX': os.environ.get('SGE_CACHE_PREFIX', 'sge'),
         'TIMEOUT': 60 * 15,  # 15 minutos, por exemplo
     }
+
+
+# Em produção, use Redis ou memcached: o lock de recálculo do app.cache depende de um add atômico.
+CACHES = {
+    'default': cache_from_url(os.environ.get('SGE_CACHE_URL', f'file://{BASE_DIR / "var" / "cache"}')),
 }
 
+# Exportações em segundo plano (app exports): onde os arquivos ficam e por quantos segundos
+# um arquivo pronto é reaproveitado para a mesma listagem com os mesmos filtros.
+EXPORTS_DIR = os.environ.get('SGE_EXPORTS_DIR', str(BASE_DIR / 'var' / 'exports'))
+EXPORTS_TTL = int(os.environ.get('SGE_EXPORTS_TTL', 60 * 60))
+
+# Métricas por rota (app.middleware.RequestMetricsMiddleware): fração das requisições medidas
+# (0 desliga) e exposição opcional no formato do Prometheus, acessível por usuários staff ou
+# com o cabeçalho "Authorization: Bearer <SGE_METRICS_TOKEN>".
+METRICS_SAMPLE_RATE = float(os.environ.get('SGE_METRICS_SAMPLE_RATE', 1.0))
+METRICS_PROMETHEUS = os.environ.get('SGE_METRICS_PROMETHEUS', '').lower() in ('1', 'true', 'yes')
+METRICS_TOKEN = os.environ.get('SGE_METRICS_TOKEN', '')
+
+# Threads usadas pelo dashboard assíncrono (/dashboard/) para calcular os widgets em paralelo;
+# cada uma abre uma conexão com o banco (ou pega uma do pool) enquanto calcula e a fecha ao
+# terminar. Entra no dimensionamento do pool (ver DATABASES).
+DASHBOARD_WORKERS = int(os.environ.get('SGE_DASHBOARD_WORKERS', 4))
+
 USE_L10N = True
 USE_THOUSAND_SEPARATOR = True
 THOUSAND_SEPARATOR = '.'  # ou ',' dependendo do seu locale
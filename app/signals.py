@@ -0,0 +1,19 @@
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from app import instrumentation
+from app.middleware import record_query
+
+
+@receiver(connection_created)
+def count_connection(sender, connection, **kwargs):
+    # Com o pool do psycopg, dispara a cada empréstimo do pool; as conexões realmente abertas ficam
+    # nas estatísticas do pool (instrumentation.database_snapshot).
+    instrumentation.record_connection(connection.alias)
+
+
+@receiver(connection_created)
+def install_query_recorder(sender, connection, **kwargs):
+    # Em toda conexão, de qualquer thread, para o RequestMetricsMiddleware contar também as consultas
+    # feitas fora da thread da requisição. O sinal se repete a cada reconexão do mesmo wrapper.
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
@@ -0,0 +1,21 @@
+from django import template
+
+
+register = template.Library()
+
+# Páginas exibidas de cada lado da página atual e em cada ponta da listagem.
+ON_EACH_SIDE = 3
+ON_ENDS = 1
+
+
+@register.simple_tag
+def page_window(page_obj, on_each_side=ON_EACH_SIDE, on_ends=ON_ENDS):
+    """
+    Números de página a exibir em torno de page_obj, com Paginator.ELLIPSIS nos intervalos omitidos.
+
+    Usa Paginator.get_elided_page_range, que gera só a janela visível: o custo não depende
+    da quantidade total de páginas (o template antigo percorria page_range inteiro).
+    """
+    return list(page_obj.paginator.get_elided_page_range(
+        page_obj.number, on_each_side=on_each_side, on_ends=on_ends,
+    ))
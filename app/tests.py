@@ -0,0 +1,160 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import Client, TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+from app import instrumentation
+from brands.models import Brand
+from categories.models import Category
+from inflows.models import Inflow
+from outflows.models import Outflow
+from products.models import Product
+from suppliers.models import Supplier
+
+
+# (rota, objeto usado como argumento da rota, consultas por requisição).
+# As páginas contam as consultas de sessão e usuário; as APIs, a do usuário do token JWT.
+PAGE_BUDGETS = (
+    ('brand_list', None, 4),
+    ('category_list', None, 4),
+    ('supplier_list', None, 4),
+    ('product_list', None, 4),
+    ('inflow_list', None, 4),
+    ('outflow_list', None, 4),
+    ('brand_detail', 'brand', 3),
+    ('category_detail', 'category', 3),
+    ('supplier_detail', 'supplier', 3),
+    ('product_detail', 'product', 3),
+    ('inflow_detail', 'inflow', 3),
+    ('outflow_detail', 'outflow', 3),
+    ('product_csv_export', None, 3),
+    ('inflow_csv_export', None, 3),
+    ('outflow_csv_export', None, 3),
+    ('dashboard_product_metrics', None, 2),
+    ('dashboard_sales_metrics', None, 2),
+    ('dashboard_products_by_category', None, 2),
+    ('dashboard_products_by_brand', None, 2),
+    ('dashboard_daily_sales', None, 2),
+)
+API_BUDGETS = (
+    ('brand_create_list_api_view', None, 2),
+    ('category_create_list_api_view', None, 2),
+    ('supplier_create_list_api_view', None, 2),
+    ('product_create_list_api_view', None, 2),
+    ('inflow_create_list_api_view', None, 2),
+    ('outflow_create_list_api_view', None, 2),
+    ('product_retrieve_delete_api_view', 'product', 2),
+    ('inflow_retrieve_delete_api_view', 'inflow', 2),
+    ('outflow_retrieve_delete_api_view', 'outflow', 2),
+)
+
+# Linhas extras da segunda medição: mais que uma página inteira de cada listagem.
+EXTRA_ROWS = 60
+
+
+def create_rows(count):
+    brand = Brand.objects.create(name='Marca (orçamento)')
+    category = Category.objects.create(name='Categoria (orçamento)')
+    supplier = Supplier.objects.create(name='Fornecedor (orçamento)')
+    Brand.objects.bulk_create([Brand(name=f'Marca {index}') for index in range(count - 1)])
+    Category.objects.bulk_create([Category(name=f'Categoria {index}') for index in range(count - 1)])
+    Supplier.objects.bulk_create([Supplier(name=f'Fornecedor {index}') for index in range(count - 1)])
+    products = Product.objects.bulk_create([
+        Product(title=f'Produto (orçamento) {index}', category=category, brand=brand,
+                cost_price=1, selling_price=2, quantity=0)
+        for index in range(count)
+    ])
+    inflows = Inflow.objects.bulk_create([
+        Inflow(product=product, supplier=supplier, quantity=1) for product in products
+    ])
+    outflows = Outflow.objects.bulk_create([Outflow(product=product, quantity=1) for product in products])
+    return dict(brand=brand, category=category, supplier=supplier,
+                product=products[0], inflow=inflows[0], outflow=outflows[0])
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class QueryBudgetTest(TestCase):
+    """
+    Consultas SQL das listagens, detalhes, exportações, widgets e APIs, medidas com 1 linha e com
+    várias páginas de dados: a contagem é a do orçamento nos dois casos (não cresce com o volume).
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser('query-budget', password=None)
+        cls.objects = create_rows(1)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+        self.api = Client(headers={'Authorization': f'Bearer {AccessToken.for_user(self.user)}'})
+
+    def test_budgets_with_one_row(self):
+        self.check_budgets()
+
+    def test_budgets_with_several_pages(self):
+        create_rows(EXTRA_ROWS)
+        self.check_budgets()
+
+    def check_budgets(self):
+        for client, budgets in ((self.client, PAGE_BUDGETS), (self.api, API_BUDGETS)):
+            for route, argument, budget in budgets:
+                with self.subTest(route=route):
+                    url = reverse(route, args=[self.objects[argument].pk] if argument else [])
+                    self.request(client, url)  # aquece caches (métricas, listas de categorias/marcas)
+                    with self.assertNumQueries(budget):
+                        self.request(client, url)
+
+    def request(self, client, url):
+        response = client.get(url)
+        self.assertEqual(response.status_code, 200, url)
+        if response.streaming:
+            b''.join(response.streaming_content)
+        return response
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class RequestMetricsMiddlewareTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        instrumentation.reset()
+        self.client.force_login(User.objects.create_superuser('admin', password='admin'))
+
+    def test_counts_queries_from_dashboard_threads(self):
+        # Com o cache vazio, os widgets consultam o banco nas threads de metrics._executor.
+        response = self.client.get('/dashboard/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(instrumentation.snapshot()['dashboard']['queries']['max'], 2)
+
+    async def test_async_request_is_recorded(self):
+        await self.async_client.aforce_login(await User.objects.aget(username='admin'))
+
+        response = await self.async_client.get('/dashboard/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(instrumentation.snapshot()['dashboard']['requests'], 1)
+
+
+# Transacional: as threads do dashboard leem a tabela do cache com conexões próprias.
+@override_settings(CACHES={'default': {
+    'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+    'LOCATION': 'sge_test_cache',
+}})
+class DashboardDatabaseCacheTest(TransactionTestCase):
+
+    def setUp(self):
+        call_command('createcachetable', verbosity=0)
+        cache.clear()
+        self.client.force_login(User.objects.create_superuser('admin', password='admin'))
+
+    def test_etag_with_database_cache(self):
+        response = self.client.get('/dashboard/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('product_metrics', response.json())
+
+        response = self.client.get('/dashboard/', headers={'If-None-Match': response.headers['ETag']})
+        self.assertEqual(response.status_code, 304)
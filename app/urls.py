@@ -12,6 +12,14 @@ urlpatterns = [
     path('api/v1/', include('authentication.urls')),
 
     path('', views.home, name='home'),
+    path('dashboard/', views.dashboard, name='dashboard'),
+    path('dashboard/product-metrics/', views.product_metrics_widget, name='dashboard_product_metrics'),
+    path('dashboard/sales-metrics/', views.sales_metrics_widget, name='dashboard_sales_metrics'),
+    path('dashboard/products-by-category/', views.products_by_category_widget, name='dashboard_products_by_category'),
+    path('dashboard/products-by-brand/', views.products_by_brand_widget, name='dashboard_products_by_brand'),
+    path('dashboard/daily-sales/', views.daily_sales_widget, name='dashboard_daily_sales'),
+    path('metrics/', views.request_metrics, name='request_metrics'),
+    path('metrics/prometheus/', views.request_metrics_prometheus, name='request_metrics_prometheus'),
 
     path('', include('brands.urls')),
     path('', include('categories.urls')),
@@ -19,4 +27,6 @@ urlpatterns = [
     path('', include('inflows.urls')),
     path('', include('outflows.urls')),
     path('', include('products.urls')),
+    path('', include('exports.urls')),
+    path('', include('sync.urls')),
 ]
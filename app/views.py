@@ -1,25 +1,126 @@
-import json
-from django.contrib.auth.decorators import login_required
+import secrets
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.decorators import login_required, permission_required, user_passes_test
+from django.http import Http404, HttpResponse, JsonResponse
 from django.shortcuts import render
-from . import metrics
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
+from . import cache, instrumentation, metrics
+from .cache import PRODUCT_METRICS, SALES_METRICS
 
 
 @login_required(login_url='login')
 def home(request):
-    product_metrics = metrics.get_product_metrics()
-    sales_metrics = metrics.get_sales_metrics()
-    graphic_product_category_metric = metrics.get_graphic_product_category_metric()
-    graphic_product_brand_metric = metrics.get_graphic_product_brand_metric()
-    daily_sales_data = metrics.get_daily_sales_data()
-    daily_sales_quantity_data = metrics.get_daily_sales_quantity_data()
-
+    # Só o esqueleto da página: cada widget busca seus dados em paralelo nos endpoints abaixo.
     context = {
-        'product_metrics': product_metrics,
-        'sales_metrics': sales_metrics,
-        'product_count_by_category': json.dumps(graphic_product_category_metric),
-        'product_count_by_brand': json.dumps(graphic_product_brand_metric),
-        'daily_sales_data': json.dumps(daily_sales_data),
-        'daily_sales_quantity_data': json.dumps(daily_sales_quantity_data),
+        'sales_window': metrics.get_sales_window(request.GET.get('days')),
+        'sales_windows': metrics.SALES_WINDOWS,
     }
-
     return render(request, 'home.html', context)
+
+
+# Widgets do dashboard: JSON pequeno por widget, com ETag derivado da versão da família de cache.
+# O navegador revalida a cada uso (no-cache) e recebe 304 enquanto os dados não mudarem.
+
+def widget(permissions, etag):
+    def decorator(view):
+        view = condition(etag_func=etag)(view)
+        view = cache_control(private=True, no_cache=True)(view)
+        view = permission_required(permissions, raise_exception=True)(view)
+        return login_required(login_url='login')(view)
+    return decorator
+
+
+def sales_window_etag(request):
+    # As séries mudam com as vendas e com a virada do dia (janela móvel).
+    days = metrics.get_sales_window(request.GET.get('days'))
+    return f'{SALES_METRICS}-{SALES_METRICS.get_version()}-{days}-{timezone.localdate()}'
+
+
+# Permissões de cada widget: as mesmas que o template usa para exibi-lo.
+WIDGET_PERMISSIONS = {
+    'product_metrics': ('products.view_product', 'inflows.view_inflow'),
+    'sales_metrics': ('outflows.view_outflow',),
+    'products_by_category': ('products.view_product',),
+    'products_by_brand': ('products.view_product',),
+    'daily_sales': ('outflows.view_outflow',),
+}
+
+
+@widget(WIDGET_PERMISSIONS['product_metrics'], lambda request: f'{PRODUCT_METRICS}-{PRODUCT_METRICS.get_version()}')
+def product_metrics_widget(request):
+    return JsonResponse(metrics.get_product_metrics().as_dict())
+
+
+@widget(WIDGET_PERMISSIONS['sales_metrics'], lambda request: f'{SALES_METRICS}-{SALES_METRICS.get_version()}')
+def sales_metrics_widget(request):
+    return JsonResponse(metrics.get_sales_metrics().as_dict())
+
+
+@widget(WIDGET_PERMISSIONS['products_by_category'], lambda request: f'{PRODUCT_METRICS}-{PRODUCT_METRICS.get_version()}-category')
+def products_by_category_widget(request):
+    return JsonResponse(metrics.get_graphic_product_category_metric())
+
+
+@widget(WIDGET_PERMISSIONS['products_by_brand'], lambda request: f'{PRODUCT_METRICS}-{PRODUCT_METRICS.get_version()}-brand')
+def products_by_brand_widget(request):
+    return JsonResponse(metrics.get_graphic_product_brand_metric())
+
+
+@widget(WIDGET_PERMISSIONS['daily_sales'], sales_window_etag)
+def daily_sales_widget(request):
+    return JsonResponse(metrics.get_daily_sales_series(metrics.get_sales_window(request.GET.get('days'))))
+
+
+def permitted_widgets(user):
+    return [name for name, permissions in WIDGET_PERMISSIONS.items() if user.has_perms(permissions)]
+
+
+def dashboard_etag(request):
+    # Muda com qualquer uma das famílias; as permissões do usuário não entram (cache privado).
+    return f'{PRODUCT_METRICS.get_version()}-{sales_window_etag(request)}'
+
+
+@login_required(login_url='login')
+@cache_control(private=True, no_cache=True)
+async def dashboard(request):
+    """
+    Todos os widgets que o usuário pode ver em um único JSON, calculados em paralelo
+    (metrics.aget_dashboard), para integrações; a home usa os endpoints de cada widget, para que
+    um widget lento não segure os demais. View assíncrona: sob ASGI não prende um worker enquanto espera.
+
+    O ETag é tratado aqui e não com @condition, que chamaria dashboard_etag dentro do event loop:
+    as versões do cache podem vir do banco (DatabaseCache).
+    """
+    etag = quote_etag(await sync_to_async(dashboard_etag)(request))
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        user = await request.auser()
+        names = await sync_to_async(permitted_widgets)(user)
+        days = metrics.get_sales_window(request.GET.get('days'))
+        response = JsonResponse(await metrics.aget_dashboard(names, days))
+    response.headers['ETag'] = etag
+    return response
+
+
+@user_passes_test(lambda user: user.is_staff, login_url='login')
+def request_metrics(request):
+    return JsonResponse({
+        'routes': instrumentation.snapshot(),
+        'cache': cache.get_stats(),
+        'database': instrumentation.database_snapshot(),
+    })
+
+
+def request_metrics_prometheus(request):
+    if not settings.METRICS_PROMETHEUS:
+        raise Http404
+    authorization = request.headers.get('Authorization', '')
+    token_ok = bool(settings.METRICS_TOKEN) and secrets.compare_digest(authorization, f'Bearer {settings.METRICS_TOKEN}')
+    if not (token_ok or request.user.is_staff):
+        return HttpResponse(status=403)
+    return HttpResponse(instrumentation.render_prometheus(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,17 @@
+# Generated by Django 5.1.4 on 2026-10-18 03:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('brands', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='brand',
+            index=models.Index(fields=['updated_at', 'id'], name='brand_updated_at_idx'),
+        ),
+    ]
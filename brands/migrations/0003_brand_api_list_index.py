@@ -0,0 +1,17 @@
+# Generated by Django 5.1.4 on 2026-10-18 04:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('brands', '0002_brand_api_sync_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='brand',
+            index=models.Index(fields=['created_at', 'id'], name='brand_created_at_idx'),
+        ),
+    ]
@@ -1,26 +1,23 @@
-import csv
 from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
 from django.views.generic import ListView, CreateView, DetailView, UpdateView, DeleteView
 from django.urls import reverse_lazy
-from django.views import View
-from django.http import HttpResponse
 from rest_framework import generics
-from openpyxl import Workbook
+from app.exports import CSVExportView, ExcelExportView, FilteredListMixin
 from brands.models import Brand
 from brands.serializers import BrandSerializer
 from . import forms
 
 
-class BrandListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
+class BrandListView(LoginRequiredMixin, PermissionRequiredMixin, FilteredListMixin, ListView):
     model = Brand
     template_name = 'brand_list.html'
     context_object_name = 'brands'
     paginate_by = 10
     permission_required = 'brands.view_brand'
 
-    def get_queryset(self):
-        queryset = super().get_queryset()
-        name = self.request.GET.get('name')
+    @classmethod
+    def filter_queryset(cls, queryset, params):
+        name = params.get('name')
         if name:
             queryset = queryset.filter(name__icontains=name)
         return queryset
@@ -55,71 +52,29 @@ class BrandDeleteView(LoginRequiredMixin, PermissionRequiredMixin, DeleteView):
     permission_required = 'brands.delete_brand'
 
 
-class BrandCSVExportView(LoginRequiredMixin, PermissionRequiredMixin, View):
+class BrandCSVExportView(CSVExportView):
+    """Exporta em CSV a lista de 'Brand', respeitando os filtros da BrandListView."""
     permission_required = 'brands.view_brand'
-    """Retorna um arquivo CSV contendo a lista de 'Brand',
-    mas respeitando o mesmo filtro usado na BrandListView."""
-    def get(self, request, *args, **kwargs):
-        # 1. Capturar o parâmetro 'name' da URL (caso exista).
-        name = request.GET.get('name', '')
-
-        # 2. Iniciar o QuerySet e aplicar o filtro, se houver.
-        queryset = Brand.objects.all()
-        if name:
-            queryset = queryset.filter(name__icontains=name)
+    list_view = BrandListView
+    filename = 'brands'
+    columns = (
+        ('ID', 'id'),
+        ('Nome', 'name'),
+        ('Descrição', 'description'),
+    )
+
 
-        # 3. Cria o HttpResponse com content_type de CSV e charset UTF-8
-        response = HttpResponse(content_type='text/csv; charset=utf-8')
-        # 4. Define o cabeçalho para download
-        response['Content-Disposition'] = 'attachment; filename="brands.csv"'
-        # 5. Escreve o BOM para garantir reconhecimento de UTF-8 por aplicativos como Excel
-        response.write('\ufeff')  # BOM
-        writer = csv.writer(response)
-        # Cabeçalho do CSV
-        writer.writerow(['ID', 'Nome', 'Descrição'])
-        # 6. Escreve as linhas com base no QuerySet filtrado
-        for brand in queryset:
-            writer.writerow([
-                brand.id,
-                brand.name,
-                brand.description
-            ])
-        return response
-
-
-class BrandExcelExportView(LoginRequiredMixin, PermissionRequiredMixin, View):
+class BrandExcelExportView(ExcelExportView):
+    """Exporta em Excel (XLSX) a lista de 'Brand', respeitando os filtros da BrandListView."""
     permission_required = 'brands.view_brand'
-    """Retorna um arquivo Excel (XLSX) contendo a lista de 'Brand',
-    mas respeitando o mesmo filtro usado na BrandListView."""
-    def get(self, request, *args, **kwargs):
-        # 1. Capturar o parâmetro 'name' da URL (caso exista).
-        name = request.GET.get('name', '')
-        # 2. Iniciar o QuerySet e aplicar o filtro, se houver.
-        queryset = Brand.objects.all()
-        if name:
-            queryset = queryset.filter(name__icontains=name)
-        # 3. Cria uma planilha nova
-        workbook = Workbook()
-        worksheet = workbook.active
-        worksheet.title = "Brands"
-        # Define o cabeçalho
-        worksheet['A1'] = 'ID'
-        worksheet['B1'] = 'Nome'
-        worksheet['C1'] = 'Descrição'
-        # 4. Preenche os dados filtrados
-        row_num = 2
-        for brand in queryset:
-            worksheet.cell(row=row_num, column=1, value=brand.id)
-            worksheet.cell(row=row_num, column=2, value=brand.name)
-            worksheet.cell(row=row_num, column=3, value=brand.description)
-            row_num += 1
-        # 5. Prepara o HttpResponse para enviar como arquivo .xlsx
-        response = HttpResponse(
-            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        )
-        response['Content-Disposition'] = 'attachment; filename="brands.xlsx"'
-        workbook.save(response)
-        return response
+    list_view = BrandListView
+    filename = 'brands'
+    sheet_title = 'Brands'
+    columns = (
+        ('ID', 'id'),
+        ('Nome', 'name'),
+        ('Descrição', 'description'),
+    )
 
 
 class BrandCreateListAPIView(generics.ListCreateAPIView):
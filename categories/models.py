@@ -9,6 +9,12 @@ class Category(models.Model):
 
     class Meta:
         ordering = ['name']
+        indexes = [
+            # Ordem padrão das APIs (ApiCursorPagination: -created_at, -id).
+            models.Index(fields=['created_at', 'id'], name='category_created_at_idx'),
+            # Sincronização incremental das APIs (?updated_at__gt=...), ordenada por (updated_at, id).
+            models.Index(fields=['updated_at', 'id'], name='category_updated_at_idx'),
+        ]
 
     def __str__(self):
         return self.name
@@ -0,0 +1,17 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from app.cache import invalidate, CATALOG_CHOICES, PRODUCT_METRICS
+from categories.models import Category
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_catalog_choices(sender, instance, **kwargs):
+    invalidate(CATALOG_CHOICES)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_metrics(sender, instance, **kwargs):
+    # Os nomes aparecem nos gráficos de produtos por categoria e por marca.
+    invalidate(PRODUCT_METRICS)
@@ -0,0 +1,11 @@
+from django.contrib import admin
+from . import models
+
+
+class ExportJobAdmin(admin.ModelAdmin):
+    list_display = ('name', 'format', 'status', 'processed_rows', 'total_rows', 'user', 'created_at', 'finished_at',)
+    list_filter = ('status', 'name', 'format',)
+    list_select_related = ('user',)
+
+
+admin.site.register(models.ExportJob, ExportJobAdmin)
@@ -0,0 +1,58 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+from exports import services
+import time
+
+
+class Command(BaseCommand):
+    help = (
+        'Executa as exportações (CSV/XLSX) enfileiradas pelas listagens. Consulta a tabela de jobs '
+        'periodicamente; vários workers podem rodar em paralelo.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float, default=2.0, help='Segundos entre consultas com a fila vazia.')
+        parser.add_argument(
+            '--stale-after',
+            type=int,
+            default=600,
+            help='Segundos sem progresso para considerar um job em andamento abandonado e devolvê-lo à fila.',
+        )
+        parser.add_argument('--once', action='store_true', help='Processa a fila atual e encerra.')
+
+    def handle(self, *args, **options):
+        if options['interval'] <= 0 or options['stale_after'] < 1:
+            raise CommandError('--interval e --stale-after devem ser maiores que zero.')
+
+        self.stdout.write(self.style.NOTICE('Worker de exportações iniciado.'))
+        try:
+            while True:
+                close_old_connections()
+                requeued = services.requeue_stale_jobs(options['stale_after'])
+                if requeued:
+                    self.stdout.write(self.style.WARNING(f'{requeued} job(s) abandonado(s) devolvido(s) à fila.'))
+                purged = services.purge_expired_jobs()
+                if purged:
+                    self.stdout.write(self.style.NOTICE(f'{purged} arquivo(s) expirado(s) removido(s).'))
+
+                job = services.claim_next_job()
+                if job:
+                    self.run(job)
+                elif options['once']:
+                    break
+                else:
+                    time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.NOTICE('Worker encerrado.'))
+
+    def run(self, job):
+        self.stdout.write(self.style.NOTICE(f'Exportando {job} ({job.params or "sem filtros"})...'))
+        started = time.monotonic()
+        try:
+            services.run_job(job)
+        except Exception as error:
+            self.stdout.write(self.style.ERROR(f'Falha na exportação {job}: {error}'))
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f'Exportação {job} concluída: {job.processed_rows} linhas em {time.monotonic() - started:.1f}s.'
+        ))
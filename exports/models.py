@@ -0,0 +1,57 @@
+from django.conf import settings
+from django.db import models
+
+
+class ExportJob(models.Model):
+    """Exportação (CSV/XLSX) de uma listagem, executada em segundo plano pelo run_export_worker."""
+    PENDING = 'pending'
+    RUNNING = 'running'
+    FINISHED = 'finished'
+    FAILED = 'failed'
+    EXPIRED = 'expired'
+    STATUS_CHOICES = [
+        (PENDING, 'Na fila'),
+        (RUNNING, 'Em andamento'),
+        (FINISHED, 'Concluída'),
+        (FAILED, 'Falhou'),
+        (EXPIRED, 'Expirada'),
+    ]
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True,
+                             related_name='export_jobs')
+    name = models.CharField(max_length=50)
+    format = models.CharField(max_length=10)
+    params = models.JSONField(default=dict, blank=True)
+    params_hash = models.CharField(max_length=64)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=PENDING)
+    total_rows = models.IntegerField(null=True, blank=True)
+    processed_rows = models.IntegerField(default=0)
+    file_path = models.CharField(max_length=500, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='export_job_queue_idx'),
+            models.Index(fields=['params_hash', 'status'], name='export_job_reuse_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.name}.{self.format} #{self.pk}'
+
+    @property
+    def progress(self):
+        """Percentual concluído (0 a 100), ou None enquanto o total não é conhecido."""
+        if self.status == self.FINISHED:
+            return 100
+        if not self.total_rows:
+            return None
+        return min(99, self.processed_rows * 100 // self.total_rows)
+
+    @property
+    def is_done(self):
+        return self.status in (self.FINISHED, self.FAILED, self.EXPIRED)
@@ -0,0 +1,142 @@
+import hashlib
+import json
+import os
+from datetime import timedelta
+from pathlib import Path
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from exports.models import ExportJob
+
+
+# Exportações que podem rodar em segundo plano: nome -> formato -> view de exportação.
+EXPORTS = {
+    'brands': {'csv': 'brands.views.BrandCSVExportView', 'xlsx': 'brands.views.BrandExcelExportView'},
+    'categories': {'csv': 'categories.views.CategoryCSVExportView', 'xlsx': 'categories.views.CategoryExcelExportView'},
+    'suppliers': {'csv': 'suppliers.views.SupplierCSVExportView', 'xlsx': 'suppliers.views.SupplierExcelExportView'},
+    'products': {'csv': 'products.views.ProductCSVExportView', 'xlsx': 'products.views.ProductExcelExportView'},
+    'inflows': {'csv': 'inflows.views.InflowCSVExportView', 'xlsx': 'inflows.views.InflowExcelExportView'},
+    'outflows': {'csv': 'outflows.views.OutflowCSVExportView', 'xlsx': 'outflows.views.OutflowExcelExportView'},
+}
+
+# Parâmetros da listagem que não mudam o conteúdo exportado.
+IGNORED_PARAMS = ('page', 'cursor')
+
+
+def get_export_view(name, format):
+    """View de exportação registrada para (name, format), ou None."""
+    path = EXPORTS.get(name, {}).get(format)
+    return import_string(path) if path else None
+
+
+def clean_params(params):
+    """Filtros da listagem como dict simples, sem paginação nem valores vazios."""
+    return {
+        key: params.get(key)
+        for key in sorted(params.keys())
+        if key not in IGNORED_PARAMS and params.get(key) not in (None, '')
+    }
+
+
+def get_params_hash(name, format, params):
+    payload = json.dumps([name, format, params], sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def find_reusable_job(params_hash):
+    """Exportação igual ainda na fila/em andamento, ou concluída dentro do EXPORTS_TTL com o arquivo em disco."""
+    recent = timezone.now() - timedelta(seconds=settings.EXPORTS_TTL)
+    in_progress = Q(status__in=[ExportJob.PENDING, ExportJob.RUNNING])
+    still_valid = Q(status=ExportJob.FINISHED, finished_at__gte=recent)
+    jobs = (
+        ExportJob.objects.filter(params_hash=params_hash)
+                         .filter(in_progress | still_valid)
+                         .order_by('-created_at')
+    )
+    for job in jobs:
+        if job.status != ExportJob.FINISHED or os.path.exists(job.file_path):
+            return job
+    return None
+
+
+def enqueue(user, name, format, params):
+    """Coloca a exportação na fila; retorna (job, criado). Reaproveita um job equivalente se houver."""
+    params = clean_params(params)
+    params_hash = get_params_hash(name, format, params)
+    job = find_reusable_job(params_hash)
+    if job:
+        return job, False
+    job = ExportJob.objects.create(user=user, name=name, format=format, params=params, params_hash=params_hash)
+    return job, True
+
+
+def claim_next_job():
+    """
+    Reserva o job mais antigo da fila para este worker, ou retorna None se a fila estiver vazia.
+
+    O UPDATE condicional (status ainda pendente) garante que dois workers nunca peguem o mesmo job.
+    """
+    while True:
+        job_id = (
+            ExportJob.objects.filter(status=ExportJob.PENDING)
+                             .order_by('created_at')
+                             .values_list('pk', flat=True)
+                             .first()
+        )
+        if job_id is None:
+            return None
+        now = timezone.now()
+        claimed = ExportJob.objects.filter(pk=job_id, status=ExportJob.PENDING).update(
+            status=ExportJob.RUNNING, started_at=now, updated_at=now,
+        )
+        if claimed:
+            return ExportJob.objects.get(pk=job_id)
+
+
+def _update(job, **fields):
+    ExportJob.objects.filter(pk=job.pk).update(updated_at=timezone.now(), **fields)
+    for field, value in fields.items():
+        setattr(job, field, value)
+
+
+def run_job(job):
+    """Gera o arquivo do job em EXPORTS_DIR, atualizando o progresso durante a escrita."""
+    view_class = get_export_view(job.name, job.format)
+    directory = Path(settings.EXPORTS_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f'{job.pk}-{view_class.filename}.{view_class.extension}'
+    partial_path = path.with_name(path.name + '.part')
+
+    view = view_class(params=job.params, on_progress=lambda count: _update(job, processed_rows=count))
+    try:
+        _update(job, total_rows=view.get_queryset().count(), processed_rows=0)
+        view.write_file(partial_path)
+        os.replace(partial_path, path)
+    except Exception as error:
+        if partial_path.exists():
+            partial_path.unlink()
+        _update(job, status=ExportJob.FAILED, error=f'{type(error).__name__}: {error}', finished_at=timezone.now())
+        raise
+    _update(job, status=ExportJob.FINISHED, file_path=str(path), finished_at=timezone.now())
+
+
+def requeue_stale_jobs(stale_after):
+    """Devolve à fila jobs em andamento sem progresso há mais de `stale_after` segundos (worker interrompido)."""
+    limit = timezone.now() - timedelta(seconds=stale_after)
+    return ExportJob.objects.filter(status=ExportJob.RUNNING, updated_at__lt=limit).update(
+        status=ExportJob.PENDING, processed_rows=0, updated_at=timezone.now(),
+    )
+
+
+def purge_expired_jobs():
+    """Apaga os arquivos de exportações concluídas há mais de EXPORTS_TTL segundos."""
+    limit = timezone.now() - timedelta(seconds=settings.EXPORTS_TTL)
+    expired = ExportJob.objects.filter(status=ExportJob.FINISHED, finished_at__lt=limit)
+    count = 0
+    for job in expired.only('pk', 'file_path'):
+        if job.file_path and os.path.exists(job.file_path):
+            os.remove(job.file_path)
+        _update(job, status=ExportJob.EXPIRED, file_path='')
+        count += 1
+    return count
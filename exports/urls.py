@@ -0,0 +1,9 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('exports/jobs/<int:pk>/', views.ExportJobDetailView.as_view(), name='export_job_detail'),
+    path('exports/jobs/<int:pk>/status/', views.ExportJobStatusView.as_view(), name='export_job_status'),
+    path('exports/jobs/<int:pk>/download/', views.ExportJobDownloadView.as_view(), name='export_job_download'),
+    path('exports/<str:name>/<str:format>/', views.ExportJobCreateView.as_view(), name='export_job_create'),
+]
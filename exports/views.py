@@ -0,0 +1,73 @@
+import os
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.exceptions import PermissionDenied
+from django.http import FileResponse, Http404, JsonResponse
+from django.shortcuts import get_object_or_404, redirect
+from django.urls import reverse
+from django.views import View
+from django.views.generic import DetailView
+from exports import services
+from exports.models import ExportJob
+
+
+def get_permitted_export_view(user, name, format):
+    view_class = services.get_export_view(name, format)
+    if view_class is None:
+        raise Http404('Exportação não encontrada.')
+    if not user.has_perm(view_class.permission_required):
+        raise PermissionDenied
+    return view_class
+
+
+class ExportJobCreateView(LoginRequiredMixin, View):
+    """Enfileira a exportação com os filtros da URL (os mesmos da listagem) e redireciona para o acompanhamento."""
+
+    def post(self, request, name, format):
+        get_permitted_export_view(request.user, name, format)
+        job, _ = services.enqueue(request.user, name, format, request.GET)
+        return redirect('export_job_detail', pk=job.pk)
+
+
+class ExportJobAccessMixin(LoginRequiredMixin):
+    """Libera o job para quem tem permissão de ver a listagem exportada."""
+
+    def get_job(self, pk):
+        job = get_object_or_404(ExportJob, pk=pk)
+        view_class = get_permitted_export_view(self.request.user, job.name, job.format)
+        return job, view_class
+
+
+class ExportJobDetailView(ExportJobAccessMixin, DetailView):
+    model = ExportJob
+    template_name = 'export_job_detail.html'
+    context_object_name = 'job'
+
+    def get_object(self, queryset=None):
+        job, _ = self.get_job(self.kwargs['pk'])
+        return job
+
+
+class ExportJobStatusView(ExportJobAccessMixin, View):
+    def get(self, request, pk):
+        job, _ = self.get_job(pk)
+        return JsonResponse({
+            'id': job.pk,
+            'status': job.status,
+            'status_display': job.get_status_display(),
+            'progress': job.progress,
+            'processed_rows': job.processed_rows,
+            'total_rows': job.total_rows,
+            'download_url': reverse('export_job_download', args=[job.pk]) if job.status == ExportJob.FINISHED else None,
+        })
+
+
+class ExportJobDownloadView(ExportJobAccessMixin, View):
+    def get(self, request, pk):
+        job, view_class = self.get_job(pk)
+        if job.status != ExportJob.FINISHED or not os.path.exists(job.file_path):
+            raise Http404('Arquivo da exportação indisponível.')
+        return FileResponse(
+            open(job.file_path, 'rb'),
+            as_attachment=True,
+            filename=f'{view_class.filename}.{view_class.extension}',
+        )
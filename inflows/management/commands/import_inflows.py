@@ -1,8 +1,16 @@
-from django.core.management.base import BaseCommand
+from collections import Counter
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from app.cache import invalidate, PRODUCT_METRICS
 from inflows.models import Inflow
 from products.models import Product
+from products.search import ProductLookup, match_products, normalize_title
+from products.services import apply_stock_deltas
+from reports.services import record_inflows_bulk
 from suppliers.models import Supplier
+from sync.services import record_changes
 import csv
+import time
 
 
 class Command(BaseCommand):
@@ -14,8 +22,24 @@ class Command(BaseCommand):
             type=str,
             help='Nome do arquivo CSV com inflows',
         )
+        parser.add_argument(
+            '--bulk',
+            action='store_true',
+            help='Importa em lotes: resolve produtos/fornecedores em memória e grava com bulk_create.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Quantidade de linhas gravadas por transação no modo --bulk.',
+        )
 
     def handle(self, *args, **options):
+        if options['bulk']:
+            if options['batch_size'] < 1:
+                raise CommandError('--batch-size deve ser maior que zero.')
+            return self.handle_bulk(options['file_name'], options['batch_size'])
+
         file_name = options['file_name']
         
         with open(file_name, 'r', encoding='utf-8-sig') as file:
@@ -32,13 +56,15 @@ class Command(BaseCommand):
                 produto_limpo = produto_original.strip()
                 
                 # Tenta primeiro buscar de forma exata, mas ignorando maiúsculo/minúsculo
-                product_obj = Product.objects.filter(title__iexact=produto_limpo).first()
+                product = Product.objects.filter(title__iexact=produto_limpo).values_list('pk', 'title').first()
 
-                if not product_obj:
-                    # Se não encontrar, tenta achar um "aproximado" (que contenha a string)
-                    product_obj = Product.objects.filter(title__icontains=produto_limpo).first()
+                if not product:
+                    # Se não encontrar, usa o título mais parecido entre os que contêm a string
+                    # (a busca já traz id e título, sem consultar o produto de novo)
+                    candidates = match_products(produto_limpo, limit=1, fuzzy=False)
+                    product = candidates[0][:2] if candidates else None
 
-                if not product_obj:
+                if not product:
                     self.stdout.write(self.style.ERROR(
                         f'Produto "{produto_original}" não encontrado. Verifique seu CSV.'
                     ))
@@ -55,17 +81,83 @@ class Command(BaseCommand):
                     continue
 
                 # Cria o Inflow
+                product_id, product_title = product
                 inflow = Inflow.objects.create(
-                    product=product_obj,
+                    product_id=product_id,
                     supplier=supplier_obj,
                     quantity=quantidade,
                     description=descricao
                 )
 
                 self.stdout.write(self.style.NOTICE(
-                    f'Inflow criado com sucesso: {inflow.product} ({inflow.quantity})'
+                    f'Inflow criado com sucesso: {product_title} ({inflow.quantity})'
                 ))
         
         self.stdout.write(self.style.SUCCESS(
             'Importação de Inflows concluída com sucesso!'
         ))
+
+    def handle_bulk(self, file_name, batch_size):
+        started = time.monotonic()
+        products = ProductLookup()
+        suppliers = {}
+        for supplier_id, name in Supplier.objects.order_by('name', 'pk').values_list('pk', 'name'):
+            suppliers.setdefault(normalize_title(name), supplier_id)
+
+        imported = skipped = 0
+        batch = []
+        with open(file_name, 'r', encoding='utf-8-sig') as file:
+            reader = csv.DictReader(file, delimiter=';')
+            for line_number, row in enumerate(reader, start=2):
+                product_id = products.get(row['produto'])
+                if product_id is None:
+                    self.stdout.write(self.style.ERROR(
+                        f'Linha {line_number}: produto "{row["produto"]}" não encontrado. Verifique seu CSV.'
+                    ))
+                    skipped += 1
+                    continue
+                supplier_id = suppliers.get(normalize_title(row['fornecedor']))
+                if supplier_id is None:
+                    self.stdout.write(self.style.ERROR(
+                        f'Linha {line_number}: fornecedor "{row["fornecedor"]}" não encontrado. Verifique seu CSV.'
+                    ))
+                    skipped += 1
+                    continue
+
+                batch.append(Inflow(
+                    product_id=product_id,
+                    supplier_id=supplier_id,
+                    quantity=int(row['quantidade']),
+                    description=row['descricao'],
+                ))
+                if len(batch) >= batch_size:
+                    imported += self.write_batch(batch)
+                    batch = []
+                    self.stdout.write(self.style.NOTICE(
+                        f'{imported} inflows gravados ({imported / (time.monotonic() - started):.0f} linhas/s)'
+                    ))
+            if batch:
+                imported += self.write_batch(batch)
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Importação de Inflows concluída: {imported} gravados, {skipped} ignorados '
+            f'em {elapsed:.1f}s ({imported / elapsed if elapsed else 0:.0f} linhas/s).'
+        ))
+
+    def write_batch(self, batch):
+        """Grava um lote de Inflow e aplica estoque e rollups na mesma transação."""
+        deltas = Counter()
+        for inflow in batch:
+            # Mesma regra do signal de estoque: apenas quantidades positivas entram no estoque.
+            if inflow.quantity > 0:
+                deltas[inflow.product_id] += inflow.quantity
+
+        with transaction.atomic():
+            # bulk_create não dispara post_save: estoque, rollups, cache e feed de alterações são tratados aqui.
+            Inflow.objects.bulk_create(batch)
+            apply_stock_deltas(deltas)
+            record_inflows_bulk(batch)
+            record_changes(Inflow, [inflow.pk for inflow in batch])
+            invalidate(PRODUCT_METRICS)
+        return len(batch)
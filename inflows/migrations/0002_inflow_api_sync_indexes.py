@@ -0,0 +1,21 @@
+# Generated by Django 5.1.4 on 2026-10-18 03:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inflows', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='inflow',
+            index=models.Index(fields=['created_at', 'id'], name='inflow_created_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='inflow',
+            index=models.Index(fields=['updated_at', 'id'], name='inflow_updated_at_idx'),
+        ),
+    ]
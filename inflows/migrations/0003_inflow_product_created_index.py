@@ -0,0 +1,24 @@
+# Generated by Django 5.1.4 on 2026-10-18 03:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inflows', '0002_inflow_api_sync_indexes'),
+    ]
+
+    operations = [
+        # Cria o índice composto antes de remover o índice simples de product_id.
+        migrations.AddIndex(
+            model_name='inflow',
+            index=models.Index(fields=['product', 'created_at', 'id'], name='inflow_product_created_idx'),
+        ),
+        migrations.AlterField(
+            model_name='inflow',
+            name='product',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.PROTECT, related_name='inflows', to='products.product'),
+        ),
+    ]
@@ -1,11 +1,12 @@
-from django.db import models
+from django.db import models, transaction
 from products.models import Product
 from suppliers.models import Supplier
 
 
 class Inflow(models.Model):
     supplier = models.ForeignKey(Supplier, on_delete=models.PROTECT, related_name='inflows')
-    product = models.ForeignKey(Product, on_delete=models.PROTECT, related_name='inflows')
+    # Sem índice próprio: o índice (product, created_at, id) também atende buscas só por product.
+    product = models.ForeignKey(Product, on_delete=models.PROTECT, related_name='inflows', db_index=False)
     quantity = models.IntegerField()
     description = models.TextField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -13,6 +14,19 @@ class Inflow(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Paginação por cursor (created_at, id) e filtros por período das listagens e APIs.
+            models.Index(fields=['created_at', 'id'], name='inflow_created_at_idx'),
+            # Movimentações de um produto em ordem de data (?product= na API, exclusão protegida).
+            models.Index(fields=['product', 'created_at', 'id'], name='inflow_product_created_idx'),
+            # Sincronização incremental das APIs (?updated_at__gt=...), ordenada por (updated_at, id).
+            models.Index(fields=['updated_at', 'id'], name='inflow_updated_at_idx'),
+        ]
 
     def __str__(self):
         return str(self.product)
+
+    def save(self, *args, **kwargs):
+        # Os signals (estoque, rollups) rodam na mesma transação do INSERT/UPDATE.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
@@ -1,12 +1,18 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
+from app.cache import invalidate, PRODUCT_METRICS
 from inflows.models import Inflow
+from products.services import add_stock
 
 
 @receiver(post_save, sender=Inflow)
 def update_product_quantity(sender, instance, created, **kwargs):
     if created:
         if instance.quantity > 0:
-            product = instance.product
-            product.quantity += instance.quantity
-            product.save()
+            add_stock(instance.product_id, instance.quantity)
+
+
+@receiver(post_save, sender=Inflow)
+@receiver(post_delete, sender=Inflow)
+def invalidate_metrics(sender, instance, **kwargs):
+    invalidate(PRODUCT_METRICS)
@@ -8,3 +8,11 @@ class OutflowAdmin(admin.ModelAdmin):
 
 
 admin.site.register(models.Outflow, OutflowAdmin)
+
+
+class ImportCheckpointAdmin(admin.ModelAdmin):
+    list_display = ('file_name', 'row_number', 'imported', 'skipped', 'finished_at', 'updated_at',)
+    search_fields = ('file_name', 'file_hash',)
+
+
+admin.site.register(models.ImportCheckpoint, ImportCheckpointAdmin)
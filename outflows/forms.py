@@ -20,7 +20,8 @@ class OutflowForm(forms.ModelForm):
     def clean_quantity(self):
         quantity = self.cleaned_data.get('quantity')
         product = self.cleaned_data.get('product')
-        if quantity > product.quantity:
+        # Validação antecipada para o usuário; a garantia real é a baixa condicional em Outflow.save.
+        if product and quantity > product.quantity:
             raise ValidationError(
                 f'A quantidade disponível em estoque para o produto {product.title} é de {product.quantity} unidades.')
         return quantity
@@ -1,12 +1,26 @@
-from django.core.management.base import BaseCommand
-from outflows.models import Outflow
+from collections import Counter
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from app.cache import invalidate, PRODUCT_METRICS, SALES_METRICS
+from outflows.models import ImportCheckpoint, Outflow
 from products.models import Product
-from suppliers.models import Supplier
+from products.search import ProductLookup
+from products.services import apply_stock_deltas
+from reports.services import record_outflows_bulk
+from sync.services import record_changes
 import csv
+import hashlib
+import time
 
 
 class Command(BaseCommand):
-    help = 'Importa dados de Outflow a partir de um arquivo CSV, buscando produto de forma case-insensitive.'
+    help = (
+        'Importa dados de Outflow a partir de um arquivo CSV (separado por ";"), buscando produto de forma '
+        'case-insensitive. O arquivo é lido em fluxo e gravado em blocos transacionais; cada bloco registra '
+        'um checkpoint (hash do arquivo + posição), então rodar o comando de novo retoma de onde parou. '
+        'Campos com quebra de linha não são suportados.'
+    )
 
     def add_arguments(self, parser):
         parser.add_argument(
@@ -14,50 +28,187 @@ class Command(BaseCommand):
             type=str,
             help='Nome do arquivo CSV com outflows',
         )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=5000,
+            help='Quantidade de linhas gravadas por transação.',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Não grava nada: apenas mede a vazão e lista produtos não encontrados e estoque insuficiente.',
+        )
+        parser.add_argument(
+            '--restart',
+            action='store_true',
+            help='Ignora o checkpoint existente e importa o arquivo desde o início.',
+        )
 
     def handle(self, *args, **options):
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size deve ser maior que zero.')
+        self.dry_run = options['dry_run']
         file_name = options['file_name']
-        
-        with open(file_name, 'r', encoding='utf-8-sig') as file:
-            # Ajuste o 'delimiter' conforme necessário (',' ou ';')
-            reader = csv.DictReader(file, delimiter=';')
-            
-            for row in reader:
-                produto_original = row['produto']  # valor que vem cru do CSV
-                
-                descricao = row['descricao']
-                quantidade = int(row['quantidade'])
-
-                # Remove espaços extras no início e final
-                produto_limpo = produto_original.strip()
-                
-                # Tenta primeiro buscar de forma exata, mas ignorando maiúsculo/minúsculo
-                product_obj = Product.objects.filter(title__iexact=produto_limpo).first()
-
-                if not product_obj:
-                    # Se não encontrar, tenta achar um "aproximado" (que contenha a string)
-                    product_obj = Product.objects.filter(title__icontains=produto_limpo).first()
-
-                if not product_obj:
-                    self.stdout.write(self.style.ERROR(
-                        f'Produto "{produto_original}" não encontrado. Verifique seu CSV.'
-                    ))
-                    continue
-                
-                
-
-                # Cria o Outflow
-                outflow = Outflow.objects.create(
-                    product=product_obj,
-                    
-                    quantity=quantidade,
-                    description=descricao
-                )
-
-                self.stdout.write(self.style.NOTICE(
-                    f'outflow criado com sucesso: {outflow.product} ({outflow.quantity})'
+
+        file_hash = self.hash_file(file_name)
+        checkpoint = None
+        if not self.dry_run:
+            checkpoint, _ = ImportCheckpoint.objects.get_or_create(
+                file_hash=file_hash, defaults=dict(file_name=file_name),
+            )
+            if options['restart']:
+                checkpoint.byte_offset = checkpoint.row_number = checkpoint.imported = checkpoint.skipped = 0
+                checkpoint.finished_at = None
+                checkpoint.save()
+            elif checkpoint.finished_at:
+                self.stdout.write(self.style.WARNING(
+                    f'Este arquivo já foi importado em {checkpoint.finished_at:%d-%m-%Y %H:%M:%S}. '
+                    'Use --restart para importá-lo novamente.'
                 ))
-        
+                return
+            elif checkpoint.row_number:
+                self.stdout.write(self.style.NOTICE(f'Retomando a partir da linha {checkpoint.row_number + 1}.'))
+
+        self.products = ProductLookup()
+        self.simulated_stock = {}
+        self.unmatched = Counter()
+        self.imported = self.skipped = 0
+        started = time.monotonic()
+
+        with open(file_name, 'rb') as file:
+            chunk = []
+            rows = self.read_rows(file, checkpoint.byte_offset if checkpoint else 0,
+                                  checkpoint.row_number if checkpoint else 0)
+            for row_number, row, offset in rows:
+                chunk.append((row_number, row))
+                if len(chunk) >= options['chunk_size']:
+                    self.write_chunk(chunk, checkpoint, offset)
+                    chunk = []
+                    self.report_progress(started)
+            if chunk:
+                self.write_chunk(chunk, checkpoint, offset)
+
+        if checkpoint:
+            checkpoint.finished_at = timezone.now()
+            checkpoint.save(update_fields=['finished_at', 'updated_at'])
+
+        for name, count in self.unmatched.most_common():
+            self.stdout.write(self.style.ERROR(f'Produto "{name}" não encontrado ({count} linhas). Verifique seu CSV.'))
+
+        elapsed = time.monotonic() - started
+        verb = 'seriam gravados' if self.dry_run else 'gravados'
         self.stdout.write(self.style.SUCCESS(
-            'Importação de outflows concluída com sucesso!'
+            f'Importação de outflows concluída: {self.imported} {verb}, {self.skipped} ignorados '
+            f'em {elapsed:.1f}s ({(self.imported + self.skipped) / elapsed if elapsed else 0:.0f} linhas/s).'
         ))
+
+    def hash_file(self, file_name):
+        digest = hashlib.sha256()
+        with open(file_name, 'rb') as file:
+            for block in iter(lambda: file.read(1024 * 1024), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def read_rows(self, file, byte_offset, row_number):
+        """
+        Gera (número da linha, linha como dict, posição do fim da linha no arquivo). Linhas com
+        número de colunas diferente do cabeçalho vêm como lista de valores, para serem ignoradas
+        em parse_chunk sem interromper o bloco.
+        """
+        header = next(csv.reader([file.readline().decode('utf-8-sig')], delimiter=';'))
+        self.columns = len(header)
+        if byte_offset:
+            file.seek(byte_offset)
+        for line in iter(file.readline, b''):
+            row_number += 1
+            if not line.strip():
+                continue
+            values = next(csv.reader([line.decode('utf-8')], delimiter=';'))
+            row = dict(zip(header, values)) if len(values) == len(header) else values
+            yield row_number, row, file.tell()
+
+    def report_progress(self, started):
+        processed = self.imported + self.skipped
+        self.stdout.write(self.style.NOTICE(
+            f'{processed} linhas processadas ({processed / (time.monotonic() - started):.0f} linhas/s)'
+        ))
+
+    def parse_chunk(self, chunk):
+        """Resolve os produtos do bloco e descarta linhas inválidas."""
+        parsed = []
+        for row_number, row in chunk:
+            if isinstance(row, list):
+                self.stdout.write(self.style.ERROR(
+                    f'Linha {row_number}: {len(row)} colunas, o cabeçalho tem {self.columns}.'
+                ))
+                self.skipped += 1
+                continue
+            product_id = self.products.get(row['produto'])
+            if product_id is None:
+                self.unmatched[row['produto'].strip()] += 1
+                self.skipped += 1
+                continue
+            try:
+                quantity = int(row['quantidade'])
+            except (TypeError, ValueError):
+                self.stdout.write(self.style.ERROR(f'Linha {row_number}: quantidade inválida "{row["quantidade"]}".'))
+                self.skipped += 1
+                continue
+            parsed.append((row_number, Outflow(product_id=product_id, quantity=quantity, description=row['descricao'])))
+        return parsed
+
+    def reserve_chunk(self, parsed, stock):
+        """Valida o estoque do bloco inteiro em memória, na ordem do arquivo."""
+        accepted = []
+        deltas = Counter()
+        for row_number, outflow in parsed:
+            if outflow.quantity > 0:
+                available = stock.get(outflow.product_id, 0)
+                if outflow.quantity > available:
+                    self.stdout.write(self.style.ERROR(
+                        f'Linha {row_number}: estoque insuficiente para o produto {outflow.product_id} '
+                        f'({available} disponíveis, {outflow.quantity} solicitados).'
+                    ))
+                    self.skipped += 1
+                    continue
+                stock[outflow.product_id] = available - outflow.quantity
+                deltas[outflow.product_id] -= outflow.quantity
+            accepted.append(outflow)
+        return accepted, deltas
+
+    def write_chunk(self, chunk, checkpoint, byte_offset):
+        parsed = self.parse_chunk(chunk)
+        product_ids = {outflow.product_id for _, outflow in parsed}
+
+        if self.dry_run:
+            missing = product_ids - self.simulated_stock.keys()
+            self.simulated_stock.update(Product.objects.filter(pk__in=missing).values_list('pk', 'quantity'))
+            accepted, _ = self.reserve_chunk(parsed, self.simulated_stock)
+            self.imported += len(accepted)
+            return
+
+        with transaction.atomic():
+            # Trava os produtos do bloco (em ordem, para evitar deadlocks): vendas concorrentes
+            # esperam o bloco terminar e o estoque validado aqui não muda até o commit.
+            stock = dict(
+                Product.objects.select_for_update()
+                               .filter(pk__in=product_ids)
+                               .order_by('pk')
+                               .values_list('pk', 'quantity')
+            )
+            accepted, deltas = self.reserve_chunk(parsed, stock)
+
+            # bulk_create não dispara post_save: estoque, rollups, cache e feed de alterações são tratados aqui.
+            Outflow.objects.bulk_create(accepted)
+            apply_stock_deltas(deltas)
+            record_outflows_bulk(accepted)
+            record_changes(Outflow, [outflow.pk for outflow in accepted])
+            invalidate(PRODUCT_METRICS, SALES_METRICS)
+
+            self.imported += len(accepted)
+            checkpoint.byte_offset = byte_offset
+            checkpoint.row_number = chunk[-1][0]
+            checkpoint.imported = checkpoint.imported + len(accepted)
+            checkpoint.skipped = checkpoint.skipped + len(chunk) - len(accepted)
+            checkpoint.save()
@@ -0,0 +1,31 @@
+# Generated by Django 5.1.4 on 2026-10-18 03:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('outflows', '0002_rename_inflow_outflow'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('file_hash', models.CharField(max_length=64, unique=True)),
+                ('file_name', models.CharField(max_length=500)),
+                ('byte_offset', models.BigIntegerField(default=0)),
+                ('row_number', models.IntegerField(default=0)),
+                ('imported', models.IntegerField(default=0)),
+                ('skipped', models.IntegerField(default=0)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['-updated_at'],
+            },
+        ),
+    ]
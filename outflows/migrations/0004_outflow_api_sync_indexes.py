@@ -0,0 +1,21 @@
+# Generated by Django 5.1.4 on 2026-10-18 03:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('outflows', '0003_importcheckpoint'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='outflow',
+            index=models.Index(fields=['created_at', 'id'], name='outflow_created_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='outflow',
+            index=models.Index(fields=['updated_at', 'id'], name='outflow_updated_at_idx'),
+        ),
+    ]
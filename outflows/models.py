@@ -1,9 +1,11 @@
-from django.db import models
+from django.db import models, transaction
 from products.models import Product
+from products.services import reserve_stock
 
 
 class Outflow(models.Model):
-    product = models.ForeignKey(Product, on_delete=models.PROTECT, related_name='outflows')
+    # Sem índice próprio: o índice (product, created_at, id) também atende buscas só por product.
+    product = models.ForeignKey(Product, on_delete=models.PROTECT, related_name='outflows', db_index=False)
     quantity = models.IntegerField()
     description = models.TextField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -11,6 +13,41 @@ class Outflow(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Paginação por cursor (created_at, id) e filtros por período das listagens e APIs.
+            models.Index(fields=['created_at', 'id'], name='outflow_created_at_idx'),
+            # Movimentações de um produto em ordem de data (?product= na API, exclusão protegida).
+            models.Index(fields=['product', 'created_at', 'id'], name='outflow_product_created_idx'),
+            # Sincronização incremental das APIs (?updated_at__gt=...), ordenada por (updated_at, id).
+            models.Index(fields=['updated_at', 'id'], name='outflow_updated_at_idx'),
+        ]
 
     def __str__(self):
         return str(self.product)
+
+    def save(self, *args, **kwargs):
+        # A baixa de estoque e os signals (rollups) rodam na mesma transação do INSERT/UPDATE.
+        # Se não houver estoque, reserve_stock levanta InsufficientStock e nada é gravado.
+        with transaction.atomic():
+            if self._state.adding and self.quantity > 0:
+                reserve_stock(self.product_id, self.quantity)
+            super().save(*args, **kwargs)
+
+
+class ImportCheckpoint(models.Model):
+    """Progresso de uma importação de saídas (import_outflows), para retomá-la após uma falha."""
+    file_hash = models.CharField(max_length=64, unique=True)
+    file_name = models.CharField(max_length=500)
+    byte_offset = models.BigIntegerField(default=0)
+    row_number = models.IntegerField(default=0)
+    imported = models.IntegerField(default=0)
+    skipped = models.IntegerField(default=0)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-updated_at']
+
+    def __str__(self):
+        return f'{self.file_name} (linha {self.row_number})'
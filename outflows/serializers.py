@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from products.services import InsufficientStock
 from . import models
 
 
@@ -7,3 +8,9 @@ class OutflowSerializer(serializers.ModelSerializer):
     class Meta:
         model = models.Outflow
         fields = '__all__'
+
+    def create(self, validated_data):
+        try:
+            return super().create(validated_data)
+        except InsufficientStock as error:
+            raise serializers.ValidationError({'quantity': [str(error)]})
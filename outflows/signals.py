@@ -1,12 +1,10 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
+from app.cache import invalidate, PRODUCT_METRICS, SALES_METRICS
 from outflows.models import Outflow
 
 
 @receiver(post_save, sender=Outflow)
-def update_product_quantity(sender, instance, created, **kwargs):
-    if created:
-        if instance.quantity > 0:
-            product = instance.product
-            product.quantity -= instance.quantity
-            product.save()
+@receiver(post_delete, sender=Outflow)
+def invalidate_metrics(sender, instance, **kwargs):
+    invalidate(PRODUCT_METRICS, SALES_METRICS)
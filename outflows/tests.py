@@ -0,0 +1,45 @@
+import os
+import tempfile
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from brands.models import Brand
+from categories.models import Category
+from outflows.models import Outflow
+from products.models import Product
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class ImportOutflowsTest(TestCase):
+
+    def setUp(self):
+        self.product = Product.objects.create(
+            title='Notebook',
+            category=Category.objects.create(name='Informática'),
+            brand=Brand.objects.create(name='Marca'),
+            cost_price=100,
+            selling_price=150,
+            quantity=10,
+        )
+
+    def import_csv(self, content):
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False, encoding='utf-8') as file:
+            file.write(content)
+        self.addCleanup(os.remove, file.name)
+        output = StringIO()
+        call_command('import_outflows', file.name, stdout=output)
+        return output.getvalue()
+
+    def test_truncated_row_is_skipped(self):
+        output = self.import_csv(
+            'produto;quantidade;descricao\n'
+            'Notebook;2;Venda 1\n'
+            'Notebook;3\n'
+            'Notebook;1;Venda 3\n'
+        )
+
+        self.assertIn('Linha 2: 2 colunas, o cabeçalho tem 3.', output)
+        self.assertIn('2 gravados, 1 ignorados', output)
+        self.assertEqual(Outflow.objects.count(), 2)
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.quantity, 7)
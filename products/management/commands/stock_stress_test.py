@@ -0,0 +1,89 @@
+import threading
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from brands.models import Brand
+from categories.models import Category
+from outflows.models import Outflow
+from products.models import Product
+from products.services import InsufficientStock
+
+
+class Command(BaseCommand):
+    help = (
+        'Teste de concorrência da baixa de estoque: várias threads criam saídas do mesmo produto '
+        'ao mesmo tempo e o estoque final é conferido. Requer PostgreSQL (grava e depois apaga '
+        'um produto temporário no banco configurado).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--stock', type=int, default=100, help='Estoque inicial do produto de teste.')
+        parser.add_argument('--threads', type=int, default=16, help='Quantidade de threads concorrentes.')
+        parser.add_argument('--attempts', type=int, default=20, help='Saídas tentadas por thread.')
+        parser.add_argument('--quantity', type=int, default=1, help='Quantidade de cada saída.')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('Este teste precisa de PostgreSQL: o SQLite serializa todas as escritas.')
+
+        stock = options['stock']
+        quantity = options['quantity']
+        brand = Brand.objects.create(name='Teste de concorrência')
+        category = Category.objects.create(name='Teste de concorrência')
+        product = Product.objects.create(
+            title='Teste de concorrência', brand=brand, category=category,
+            cost_price=1, selling_price=1, quantity=stock,
+        )
+
+        results = {'created': 0, 'refused': 0, 'errors': []}
+        lock = threading.Lock()
+        start = threading.Barrier(options['threads'])
+
+        def worker():
+            try:
+                start.wait()
+                for _ in range(options['attempts']):
+                    try:
+                        Outflow.objects.create(product_id=product.pk, quantity=quantity)
+                        key = 'created'
+                    except InsufficientStock:
+                        key = 'refused'
+                    with lock:
+                        results[key] += 1
+            except Exception as error:
+                with lock:
+                    results['errors'].append(repr(error))
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=worker) for _ in range(options['threads'])]
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            product.refresh_from_db()
+            outflows = Outflow.objects.filter(product=product).count()
+        finally:
+            Outflow.objects.filter(product=product).delete()
+            product.delete()
+            brand.delete()
+            category.delete()
+
+        expected_created = min(stock // quantity, options['threads'] * options['attempts'])
+        self.stdout.write(
+            f'Saídas criadas: {results["created"]}, recusadas: {results["refused"]}, '
+            f'estoque final: {product.quantity}'
+        )
+        problems = list(results['errors'])
+        if product.quantity < 0:
+            problems.append(f'estoque negativo ({product.quantity})')
+        if product.quantity != stock - results['created'] * quantity:
+            problems.append('estoque final não bate com as saídas criadas')
+        if outflows != results['created']:
+            problems.append(f'{outflows} saídas gravadas para {results["created"]} confirmadas')
+        if results['created'] != expected_created:
+            problems.append(f'esperadas {expected_created} saídas criadas')
+        if problems:
+            raise CommandError('Falhou: ' + '; '.join(problems))
+        self.stdout.write(self.style.SUCCESS('Estoque consistente sob concorrência.'))
@@ -0,0 +1,38 @@
+# Generated by Django 5.1.4 on 2026-10-18 03:33
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+def create_trigram_index(apps, schema_editor):
+    # Índice de trigramas só existe no PostgreSQL; no SQLite a busca usa o fallback de products.search.
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS product_title_trgm_idx '
+        'ON products_product USING gin (UPPER(title) gin_trgm_ops)'
+    )
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS product_title_trgm_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('brands', '0001_initial'),
+        ('categories', '0001_initial'),
+        ('products', '0002_rename_produtc_product'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(django.db.models.functions.text.Upper('title'), name='product_title_upper_idx'),
+        ),
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
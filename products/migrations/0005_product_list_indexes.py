@@ -0,0 +1,23 @@
+# Generated by Django 5.1.4 on 2026-10-18 03:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('brands', '0002_brand_api_sync_indexes'),
+        ('categories', '0002_category_api_sync_indexes'),
+        ('products', '0004_product_api_sync_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['title'], name='product_title_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['serie_number'], name='product_serie_number_idx'),
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models.functions import Upper
 from brands.models import Brand
 from categories.models import Category
 
@@ -17,6 +18,17 @@ class Product(models.Model):
 
     class Meta:
         ordering = ['title']
+        indexes = [
+            # Buscas exatas sem diferença de caixa (title__iexact) dos importadores.
+            models.Index(Upper('title'), name='product_title_upper_idx'),
+            # Ordem padrão (listagem paginada e exportações) e filtro exato por número de série.
+            models.Index(fields=['title'], name='product_title_idx'),
+            models.Index(fields=['serie_number'], name='product_serie_number_idx'),
+            # Ordem padrão das APIs (ApiCursorPagination: -created_at, -id).
+            models.Index(fields=['created_at', 'id'], name='product_created_at_idx'),
+            # Sincronização incremental das APIs (?updated_at__gt=...), ordenada por (updated_at, id).
+            models.Index(fields=['updated_at', 'id'], name='product_updated_at_idx'),
+        ]
 
     def __str__(self):
         return self.title
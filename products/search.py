@@ -0,0 +1,104 @@
+"""
+Busca de produtos por título, usada pelos importadores e pelos filtros das listagens.
+
+No PostgreSQL, a migração products.0003 cria um índice GIN de trigramas sobre UPPER(title):
+é o mesmo formato gerado por title__icontains (UPPER(title) LIKE UPPER('%...%')) e pelo
+operador de similaridade (%), então as duas buscas usam o índice em vez de varrer a tabela.
+No SQLite (desenvolvimento) não há trigramas: a busca aproximada vira LIKE e o ranking é
+calculado em Python sobre um conjunto limitado de candidatos.
+"""
+from difflib import SequenceMatcher
+from django.contrib.postgres.lookups import TrigramSimilar
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db import connection
+from django.db.models import Q
+from django.db.models.functions import Upper
+from products.models import Product
+
+
+# Quantidade máxima de candidatos ranqueados em Python quando não há pg_trgm.
+FALLBACK_CANDIDATES = 200
+
+
+def normalize_title(value):
+    """Forma canônica de um nome para comparação: sem espaços extras e sem diferença de caixa."""
+    return ' '.join(value.split()).casefold()
+
+
+def _rank(name, candidates, limit):
+    """Ordena (id, título, score) por score; títulos iguais a `name` (normalizados) valem 1.0."""
+    key = normalize_title(name)
+    scored = []
+    for product_id, title, score in candidates:
+        if normalize_title(title) == key:
+            score = 1.0
+        elif score is None:
+            score = SequenceMatcher(None, key, normalize_title(title)).ratio()
+        scored.append((product_id, title, score))
+    scored.sort(key=lambda candidate: (-candidate[2], candidate[1]))
+    return scored[:limit]
+
+
+def match_products(name, limit=5, fuzzy=True):
+    """
+    Retorna até `limit` candidatos (id, título, score) para `name`, do mais parecido ao menos.
+
+    Com fuzzy=False só entram títulos que contêm `name` (o antigo fallback title__icontains,
+    agora com o mais parecido primeiro); com fuzzy=True também entram títulos apenas
+    semelhantes (similaridade de trigramas no PostgreSQL, palavras em comum no SQLite).
+    """
+    term = ' '.join(name.split())
+    if not term:
+        return []
+
+    if connection.vendor == 'postgresql':
+        condition = Q(title__icontains=term)
+        if fuzzy:
+            condition |= TrigramSimilar(Upper('title'), term.upper())
+        rows = (
+            Product.objects.filter(condition)
+                           .annotate(score=TrigramSimilarity(Upper('title'), term.upper()))
+                           .order_by('-score', 'title')
+                           .values_list('pk', 'title', 'score')[:limit]
+        )
+        return _rank(term, rows, limit)
+
+    condition = Q(title__icontains=term)
+    if fuzzy:
+        for word in term.split():
+            condition |= Q(title__icontains=word)
+    rows = Product.objects.filter(condition).values_list('pk', 'title')[:FALLBACK_CANDIDATES]
+    return _rank(term, [(product_id, title, None) for product_id, title in rows], limit)
+
+
+def best_match(name, fuzzy=False):
+    """Id do candidato mais parecido com `name`, ou None."""
+    candidates = match_products(name, limit=1, fuzzy=fuzzy)
+    return candidates[0][0] if candidates else None
+
+
+class ProductLookup:
+    """
+    Resolve nomes de produto vindos de arquivos para ids de Product.
+
+    Carrega todos os títulos normalizados com uma única consulta; nomes sem correspondência
+    exata caem em best_match (títulos que contêm o nome), consultado no máximo uma vez por nome.
+    """
+
+    def __init__(self):
+        self.ids = {}
+        titles = Product.objects.order_by('title', 'pk').values_list('pk', 'title')
+        for product_id, title in titles.iterator(chunk_size=10000):
+            self.ids.setdefault(normalize_title(title), product_id)
+        self._approximate = {}
+
+    def get(self, name):
+        key = normalize_title(name)
+        if not key:
+            return None
+        product_id = self.ids.get(key)
+        if product_id is None:
+            if key not in self._approximate:
+                self._approximate[key] = best_match(name)
+            product_id = self._approximate[key]
+        return product_id
@@ -0,0 +1,63 @@
+from django.db.models import Case, F, IntegerField, Value, When
+from django.utils import timezone
+from products.models import Product
+from sync.services import record_changes
+
+
+class InsufficientStock(Exception):
+    """Baixa de estoque recusada porque o produto não tem unidades suficientes."""
+
+    def __init__(self, product_id, requested, available, title=''):
+        self.product_id = product_id
+        self.requested = requested
+        self.available = available
+        self.title = title
+        super().__init__(
+            f'A quantidade disponível em estoque para o produto {title} é de {available} unidades.'
+        )
+
+
+# Os UPDATEs de estoque não passam por save(): updated_at e o feed de sincronização
+# (sync.services.record_changes) são atualizados aqui, para a API enxergar a mudança.
+def add_stock(product_id, quantity):
+    """Soma `quantity` ao estoque com um único UPDATE atômico."""
+    Product.objects.filter(pk=product_id).update(quantity=F('quantity') + quantity, updated_at=timezone.now())
+    record_changes(Product, [product_id])
+
+
+def reserve_stock(product_id, quantity):
+    """
+    Baixa `quantity` unidades do estoque, sem nunca deixá-lo negativo.
+
+    É um UPDATE condicional (... SET quantity = quantity - n WHERE id = %s AND quantity >= n):
+    o banco serializa baixas concorrentes do mesmo produto, e a que encontrar estoque
+    insuficiente não altera nada e levanta InsufficientStock. Deve ser chamado dentro da
+    transação que grava a saída, para que as duas coisas sejam confirmadas juntas.
+    """
+    updated = (
+        Product.objects.filter(pk=product_id, quantity__gte=quantity)
+                       .update(quantity=F('quantity') - quantity, updated_at=timezone.now())
+    )
+    if not updated:
+        product = Product.objects.filter(pk=product_id).values('title', 'quantity').first() or {}
+        raise InsufficientStock(product_id, quantity, product.get('quantity', 0), product.get('title', ''))
+    record_changes(Product, [product_id])
+
+
+def apply_stock_deltas(deltas):
+    """
+    Aplica vários deltas de estoque ({product_id: delta}) com um único UPDATE.
+
+    Usado pelos importadores em lote: UPDATE ... SET quantity = quantity + CASE id WHEN ... END.
+    """
+    if not deltas:
+        return
+    Product.objects.filter(pk__in=deltas).update(
+        quantity=F('quantity') + Case(
+            *[When(pk=product_id, then=Value(delta)) for product_id, delta in deltas.items()],
+            default=Value(0),
+            output_field=IntegerField(),
+        ),
+        updated_at=timezone.now(),
+    )
+    record_changes(Product, deltas)
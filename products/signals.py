@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from app.cache import invalidate, PRODUCT_METRICS, SALES_METRICS
+from products.models import Product
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def invalidate_metrics(sender, instance, **kwargs):
+    # Preços e estoque entram tanto nas métricas de produtos quanto nas de vendas.
+    invalidate(PRODUCT_METRICS, SALES_METRICS)
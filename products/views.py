@@ -1,32 +1,33 @@
-import csv
 from django.views.generic import ListView, CreateView, DetailView, UpdateView, DeleteView
 from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
 from django.urls import reverse_lazy
-from django.views import View
-from django.http import HttpResponse
 from rest_framework import generics
-from openpyxl import Workbook
+from app.exports import CSVExportView, ExcelExportView, FilteredListMixin
 from products.models import Product
 from products.serializers import ProductSerializer
 from . import forms
 from brands.models import Brand
 from categories.models import Category
 from app import metrics
+from app.cache import CATALOG_CHOICES
 
 
-class ProductListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
+class ProductListView(LoginRequiredMixin, PermissionRequiredMixin, FilteredListMixin, ListView):
     model = Product
+    queryset = Product.objects.select_related('category', 'brand').only(
+        'title', 'cost_price', 'selling_price', 'serie_number', 'quantity', 'category__name', 'brand__name',
+    )
     template_name = 'product_list.html'
     context_object_name = 'products'
     paginate_by = 10
     permission_required = 'products.view_product'
 
-    def get_queryset(self):
-        queryset = super().get_queryset()
-        title = self.request.GET.get('title')
-        category = self.request.GET.get('category')
-        brand = self.request.GET.get('brand')
-        serie_number = self.request.GET.get('serie_number')
+    @classmethod
+    def filter_queryset(cls, queryset, params):
+        title = params.get('title')
+        category = params.get('category')
+        brand = params.get('brand')
+        serie_number = params.get('serie_number')
         if title:
             queryset = queryset.filter(title__icontains=title)
         if category:
@@ -34,14 +35,14 @@ class ProductListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
         if brand:
             queryset = queryset.filter(brand__id=brand)
         if serie_number:
-            queryset = queryset.filter(brand__id=serie_number)
+            queryset = queryset.filter(serie_number=serie_number)
         return queryset
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['product_metrics'] = metrics.get_product_metrics()
-        context['categories'] = Category.objects.all()
-        context['brands'] = Brand.objects.all()
+        context['categories'] = CATALOG_CHOICES.get_or_compute(lambda: list(Category.objects.all()), 'categories')
+        context['brands'] = CATALOG_CHOICES.get_or_compute(lambda: list(Brand.objects.all()), 'brands')
         return context
 
 
@@ -55,6 +56,7 @@ class ProductCreateView(LoginRequiredMixin, PermissionRequiredMixin, CreateView)
 
 class ProductDetailView(LoginRequiredMixin, PermissionRequiredMixin, DetailView):
     model = Product
+    queryset = Product.objects.select_related('category', 'brand')
     template_name = 'product_detail.html'
     permission_required = 'products.view_product'
 
@@ -74,97 +76,43 @@ class ProductDeleteView(LoginRequiredMixin, PermissionRequiredMixin, DeleteView)
     permission_required = 'products.delete_product'
 
 
-class ProductCSVExportView(LoginRequiredMixin, PermissionRequiredMixin, View):
+class ProductCSVExportView(CSVExportView):
+    """Exporta em CSV a lista de 'Product', respeitando os filtros da ProductListView."""
     permission_required = 'products.view_product'
-    """
-    Retorna um arquivo CSV contendo a lista de 'product',
-    mas respeitando o mesmo filtro usado na productListView.
-    """
-    def get(self, request, *args, **kwargs):
-        # 1. Capturar o parâmetro 'title' da URL (caso exista).
-        title = request.GET.get('title', '')
-        # 2. Iniciar o QuerySet e aplicar o filtro, se houver.
-        queryset = Product.objects.all()
-        if title:
-            queryset = queryset.filter(title__icontains=title)
-        # 3. Cria o HttpResponse com content_type de CSV e charset UTF-8
-        response = HttpResponse(content_type='text/csv; charset=utf-8')
-        # 4. Define o cabeçalho para download
-        response['Content-Disposition'] = 'attachment; filename="products.csv"'
-        # 5. Escreve o BOM para garantir reconhecimento de UTF-8 por aplicativos como Excel
-        response.write('\ufeff')  # BOM
-        writer = csv.writer(response)
-        # Cabeçalho do CSV
-        writer.writerow(['ID', 'Produto', 'Categoria', 'Marca', 'Descrição',
-                         'Número de Série', 'Preço de Custo', 'Preço de Venda',
-                         'Data de Criação', 'Data de Atualização', 'Quantidade'])
-        # 6. Escreve as linhas com base no QuerySet filtrado
-        for product in queryset:
-            writer.writerow([
-                product.id,
-                product.title,
-                product.category,
-                product.brand,
-                product.description,
-                product.serie_number,
-                product.cost_price,
-                product.selling_price,
-                product.created_at,
-                product.updated_at,
-                product.quantity
-            ])
-        return response
-
-
-class ProductExcelExportView(LoginRequiredMixin, PermissionRequiredMixin, View):
+    list_view = ProductListView
+    filename = 'products'
+    columns = (
+        ('ID', 'id'),
+        ('Produto', 'title'),
+        ('Categoria', 'category__name'),
+        ('Marca', 'brand__name'),
+        ('Descrição', 'description'),
+        ('Número de Série', 'serie_number'),
+        ('Preço de Custo', 'cost_price'),
+        ('Preço de Venda', 'selling_price'),
+        ('Data de Criação', 'created_at'),
+        ('Data de Atualização', 'updated_at'),
+        ('Quantidade', 'quantity'),
+    )
+
+
+class ProductExcelExportView(ExcelExportView):
+    """Exporta em Excel (XLSX) a lista de 'Product', respeitando os filtros da ProductListView."""
     permission_required = 'products.view_product'
-    """
-    Retorna um arquivo Excel (XLSX) contendo a lista de 'product',
-    mas respeitando o mesmo filtro usado na productListView.
-    """
-    def get(self, request, *args, **kwargs):
-        # 1. Capturar o parâmetro 'title' da URL (caso exista).
-        title = request.GET.get('title', '')
-        # 2. Iniciar o QuerySet e aplicar o filtro, se houver.
-        queryset = Product.objects.all()
-        if title:
-            queryset = queryset.filter(title__icontains=title)
-        # 3. Cria uma planilha nova
-        workbook = Workbook()
-        worksheet = workbook.active
-        worksheet.title = "products"
-        # Define o cabeçalho
-        worksheet['A1'] = 'ID'
-        worksheet['B1'] = 'Produto'
-        worksheet['C1'] = 'Categoria'
-        worksheet['D1'] = 'Descrição'
-        worksheet['E1'] = 'Número de Série'
-        worksheet['F1'] = 'Preço de Custo'
-        worksheet['G1'] = 'Preço de Venda'
-        worksheet['H1'] = 'Data de Criação'
-        worksheet['I1'] = 'Data de Atualização'
-        worksheet['J1'] = 'Quantidade'
-        # 4. Preenche os dados filtrados
-        row_num = 2
-        for product in queryset:
-            worksheet.cell(row=row_num, column=1, value=product.id)
-            worksheet.cell(row=row_num, column=2, value=product.title)
-            worksheet.cell(row=row_num, column=3, value=str(product.category))
-            worksheet.cell(row=row_num, column=4, value=product.description)
-            worksheet.cell(row=row_num, column=5, value=product.serie_number)
-            worksheet.cell(row=row_num, column=6, value=product.cost_price)
-            worksheet.cell(row=row_num, column=7, value=product.selling_price)
-            worksheet.cell(row=row_num, column=8, value=product.created_at)
-            worksheet.cell(row=row_num, column=9, value=product.updated_at)
-            worksheet.cell(row=row_num, column=10, value=product.quantity)
-            row_num += 1
-        # 5. Prepara o HttpResponse para enviar como arquivo .xlsx
-        response = HttpResponse(
-            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        )
-        response['Content-Disposition'] = 'attachment; filename="products.xlsx"'
-        workbook.save(response)
-        return response
+    list_view = ProductListView
+    filename = 'products'
+    columns = (
+        ('ID', 'id'),
+        ('Produto', 'title'),
+        ('Categoria', 'category__name'),
+        ('Descrição', 'description'),
+        ('Número de Série', 'serie_number'),
+        ('Preço de Custo', 'cost_price'),
+        ('Preço de Venda', 'selling_price'),
+        ('Data de Criação', 'created_at'),
+        ('Data de Atualização', 'updated_at'),
+        ('Quantidade', 'quantity'),
+    )
 
 
 class ProductCreateListAPIView(generics.ListCreateAPIView):
@@ -0,0 +1,18 @@
+from django.contrib import admin
+from . import models
+
+
+class DailyProductSalesAdmin(admin.ModelAdmin):
+    list_display = ('product', 'date', 'quantity', 'sales_count',)
+    search_fields = ('product__title',)
+    list_select_related = ('product',)
+
+
+class DailyStockMovementAdmin(admin.ModelAdmin):
+    list_display = ('product', 'date', 'inflow_quantity', 'outflow_quantity',)
+    search_fields = ('product__title',)
+    list_select_related = ('product',)
+
+
+admin.site.register(models.DailyProductSales, DailyProductSalesAdmin)
+admin.site.register(models.DailyStockMovement, DailyStockMovementAdmin)
@@ -0,0 +1,47 @@
+from datetime import date
+from django.core.management.base import BaseCommand, CommandError
+from reports import services
+
+
+class Command(BaseCommand):
+    help = 'Compara as tabelas de rollup com Inflow/Outflow e lista as divergências.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--since', type=date.fromisoformat, help='Primeiro dia a verificar (AAAA-MM-DD).')
+        parser.add_argument('--until', type=date.fromisoformat, help='Último dia a verificar (AAAA-MM-DD).')
+        parser.add_argument('--chunk-days', type=int, default=30, help='Quantidade de dias verificados por vez.')
+        parser.add_argument(
+            '--repair',
+            action='store_true',
+            help='Recalcula os dias divergentes em vez de apenas reportá-los.',
+        )
+
+    def handle(self, *args, **options):
+        if options['chunk_days'] < 1:
+            raise CommandError('--chunk-days deve ser maior que zero.')
+
+        bounds = services.get_history_bounds()
+        if bounds is None:
+            self.stdout.write(self.style.SUCCESS('Nenhuma movimentação encontrada.'))
+            return
+        first_day = options['since'] or bounds[0]
+        last_day = options['until'] or bounds[1]
+
+        found = 0
+        for chunk_start, chunk_end in services.iter_chunks(first_day, last_day, options['chunk_days']):
+            discrepancies = services.find_discrepancies(chunk_start, chunk_end)
+            found += len(discrepancies)
+            for model_name, product_id, day, expected, stored in discrepancies:
+                self.stdout.write(self.style.ERROR(
+                    f'{model_name} produto={product_id} dia={day}: esperado {expected}, gravado {stored}'
+                ))
+            if options['repair']:
+                for day in sorted({discrepancy[2] for discrepancy in discrepancies}):
+                    services.rebuild_range(day, day)
+
+        if not found:
+            self.stdout.write(self.style.SUCCESS(f'Rollups consistentes de {first_day} a {last_day}.'))
+        elif options['repair']:
+            self.stdout.write(self.style.SUCCESS(f'{found} divergências corrigidas.'))
+        else:
+            raise CommandError(f'{found} divergências encontradas. Use --repair para recalculá-las.')
@@ -0,0 +1,53 @@
+from datetime import date
+from django.core.management.base import BaseCommand, CommandError
+from reports import services
+
+
+class Command(BaseCommand):
+    help = (
+        'Recalcula as tabelas de rollup (vendas e movimentações diárias) a partir do histórico, em blocos de dias. '
+        'No PostgreSQL pode rodar com o sistema no ar (cada bloco trava as rollups); no SQLite, pare as escritas.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--since',
+            type=date.fromisoformat,
+            help='Primeiro dia a recalcular (AAAA-MM-DD). Padrão: primeira movimentação registrada.',
+        )
+        parser.add_argument(
+            '--until',
+            type=date.fromisoformat,
+            help='Último dia a recalcular (AAAA-MM-DD). Padrão: última movimentação registrada.',
+        )
+        parser.add_argument(
+            '--chunk-days',
+            type=int,
+            default=30,
+            help='Quantidade de dias recalculados por transação.',
+        )
+
+    def handle(self, *args, **options):
+        if options['chunk_days'] < 1:
+            raise CommandError('--chunk-days deve ser maior que zero.')
+
+        bounds = services.get_history_bounds()
+        if bounds is None:
+            self.stdout.write(self.style.WARNING('Nenhuma movimentação encontrada.'))
+            return
+        first_day = options['since'] or bounds[0]
+        last_day = options['until'] or bounds[1]
+
+        total_sales = total_movements = 0
+        for chunk_start, chunk_end in services.iter_chunks(first_day, last_day, options['chunk_days']):
+            sales, movements = services.rebuild_range(chunk_start, chunk_end)
+            total_sales += sales
+            total_movements += movements
+            self.stdout.write(self.style.NOTICE(
+                f'{chunk_start} a {chunk_end}: {sales} linhas de vendas, {movements} linhas de movimentação'
+            ))
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Rollups recalculadas de {first_day} a {last_day}: '
+            f'{total_sales} linhas de vendas, {total_movements} linhas de movimentação.'
+        ))
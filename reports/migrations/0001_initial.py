@@ -0,0 +1,46 @@
+# Generated by Django 5.1.4 on 2026-10-18 03:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('products', '0002_rename_produtc_product'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyProductSales',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('quantity', models.IntegerField(default=0)),
+                ('sales_count', models.IntegerField(default=0)),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_sales', to='products.product')),
+            ],
+            options={
+                'ordering': ['-date'],
+                'indexes': [models.Index(fields=['date'], name='daily_sales_date_idx')],
+                'constraints': [models.UniqueConstraint(fields=('product', 'date'), name='unique_daily_product_sales')],
+            },
+        ),
+        migrations.CreateModel(
+            name='DailyStockMovement',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('inflow_quantity', models.IntegerField(default=0)),
+                ('outflow_quantity', models.IntegerField(default=0)),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stock_movements', to='products.product')),
+            ],
+            options={
+                'ordering': ['-date'],
+                'indexes': [models.Index(fields=['date'], name='daily_movement_date_idx')],
+                'constraints': [models.UniqueConstraint(fields=('product', 'date'), name='unique_daily_stock_movement')],
+            },
+        ),
+    ]
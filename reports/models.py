@@ -0,0 +1,42 @@
+from django.db import models
+from products.models import Product
+
+
+class DailyProductSales(models.Model):
+    """Vendas (Outflow) agregadas por produto e dia, mantidas pelos signals de reports."""
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='daily_sales')
+    date = models.DateField()
+    quantity = models.IntegerField(default=0)
+    sales_count = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ['-date']
+        constraints = [
+            models.UniqueConstraint(fields=['product', 'date'], name='unique_daily_product_sales'),
+        ]
+        indexes = [
+            models.Index(fields=['date'], name='daily_sales_date_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.product} - {self.date}'
+
+
+class DailyStockMovement(models.Model):
+    """Entradas e saídas de estoque agregadas por produto e dia."""
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='daily_stock_movements')
+    date = models.DateField()
+    inflow_quantity = models.IntegerField(default=0)
+    outflow_quantity = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ['-date']
+        constraints = [
+            models.UniqueConstraint(fields=['product', 'date'], name='unique_daily_stock_movement'),
+        ]
+        indexes = [
+            models.Index(fields=['date'], name='daily_movement_date_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.product} - {self.date}'
@@ -0,0 +1,256 @@
+from datetime import datetime, time, timedelta
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Case, Count, F, IntegerField, Sum, Value, When
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from inflows.models import Inflow
+from outflows.models import Outflow
+from reports.models import DailyProductSales, DailyStockMovement
+
+
+BULK_BATCH_SIZE = 1000
+
+# Advisory lock do PostgreSQL que separa os incrementos das rollups (compartilhado: não bloqueiam
+# uns aos outros) do recálculo em rebuild_range (exclusivo), que espera as transações com
+# incrementos em andamento terminarem e segura as novas até o commit.
+ROLLUP_LOCK_KEY = 0x524F4C4C5550  # 'ROLLUP'
+
+
+def lock_rollups(exclusive=False):
+    """Trava as rollups até o fim da transação atual (sem efeito fora do PostgreSQL)."""
+    if connection.vendor != 'postgresql':
+        return
+    function = 'pg_advisory_xact_lock' if exclusive else 'pg_advisory_xact_lock_shared'
+    with connection.cursor() as cursor:
+        cursor.execute(f'SELECT {function}(%s)', [ROLLUP_LOCK_KEY])
+
+
+def day_bounds(first_day, last_day):
+    """Intervalo semiaberto [início, fim) de datetimes que cobre os dias de first_day a last_day."""
+    tz = timezone.get_current_timezone()
+    start = datetime.combine(first_day, time.min, tzinfo=tz)
+    end = datetime.combine(last_day + timedelta(days=1), time.min, tzinfo=tz)
+    return start, end
+
+
+def _increment(model, product_id, date, **deltas):
+    """
+    Upsert incremental: soma `deltas` na linha (product, date), criando-a se não existir.
+
+    O UPDATE com F() é atômico no banco; se duas transações tentarem criar a mesma linha,
+    a que perder a corrida na constraint única repete o UPDATE.
+    """
+    lookup = dict(product_id=product_id, date=date)
+    updates = {field: F(field) + value for field, value in deltas.items()}
+    if model.objects.filter(**lookup).update(**updates):
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(**lookup, **deltas)
+    except IntegrityError:
+        model.objects.filter(**lookup).update(**updates)
+
+
+def _increment_many(model, date, deltas):
+    """
+    Versão em lote de _increment: deltas = {product_id: {campo: delta}}, todos no mesmo dia.
+
+    Primeiro garante que as linhas existam (INSERT ... ON CONFLICT DO NOTHING) e depois soma
+    os deltas com um único UPDATE usando CASE, sem corrida com os signals.
+    """
+    if not deltas:
+        return
+    model.objects.bulk_create(
+        [model(product_id=product_id, date=date) for product_id in deltas],
+        ignore_conflicts=True,
+        batch_size=BULK_BATCH_SIZE,
+    )
+    fields = {field for values in deltas.values() for field in values}
+    model.objects.filter(date=date, product_id__in=deltas).update(**{
+        field: F(field) + Case(
+            *[When(product_id=product_id, then=Value(values.get(field, 0)))
+              for product_id, values in deltas.items()],
+            default=Value(0),
+            output_field=IntegerField(),
+        )
+        for field in fields
+    })
+
+
+def _group_by_day(movements):
+    """Agrupa movimentações já gravadas em {dia: {product_id: (quantidade, registros)}}."""
+    days = {}
+    for movement in movements:
+        totals = days.setdefault(timezone.localdate(movement.created_at), {})
+        quantity, count = totals.get(movement.product_id, (0, 0))
+        totals[movement.product_id] = (quantity + movement.quantity, count + 1)
+    return days
+
+
+def record_inflows_bulk(inflows):
+    """Aplica nas rollups entradas criadas com bulk_create (que não dispara signals)."""
+    lock_rollups()
+    for date, totals in _group_by_day(inflows).items():
+        _increment_many(DailyStockMovement, date, {
+            product_id: {'inflow_quantity': quantity} for product_id, (quantity, _) in totals.items()
+        })
+
+
+def record_outflows_bulk(outflows):
+    """Aplica nas rollups saídas criadas com bulk_create (que não dispara signals)."""
+    lock_rollups()
+    for date, totals in _group_by_day(outflows).items():
+        _increment_many(DailyProductSales, date, {
+            product_id: {'quantity': quantity, 'sales_count': count}
+            for product_id, (quantity, count) in totals.items()
+        })
+        _increment_many(DailyStockMovement, date, {
+            product_id: {'outflow_quantity': quantity} for product_id, (quantity, _) in totals.items()
+        })
+
+
+def record_outflow(product_id, created_at, quantity, sign=1):
+    """Aplica uma saída (sign=1) ou o seu estorno (sign=-1) nas rollups do dia."""
+    lock_rollups()
+    date = timezone.localdate(created_at)
+    _increment(DailyProductSales, product_id, date, quantity=sign * quantity, sales_count=sign)
+    _increment(DailyStockMovement, product_id, date, outflow_quantity=sign * quantity)
+
+
+def record_inflow(product_id, created_at, quantity, sign=1):
+    """Aplica uma entrada (sign=1) ou o seu estorno (sign=-1) nas rollups do dia."""
+    lock_rollups()
+    date = timezone.localdate(created_at)
+    _increment(DailyStockMovement, product_id, date, inflow_quantity=sign * quantity)
+
+
+def _aggregate_sales(first_day, last_day, product_ids=None):
+    """Vendas por (produto, dia) calculadas direto de Outflow."""
+    start, end = day_bounds(first_day, last_day)
+    queryset = Outflow.objects.filter(created_at__gte=start, created_at__lt=end)
+    if product_ids is not None:
+        queryset = queryset.filter(product_id__in=product_ids)
+    rows = (
+        queryset.annotate(day=TruncDate('created_at'))
+                .values('product_id', 'day')
+                .annotate(quantity=Sum('quantity'), sales_count=Count('id'))
+                .order_by()
+    )
+    return {
+        (row['product_id'], row['day']): dict(quantity=row['quantity'], sales_count=row['sales_count'])
+        for row in rows
+    }
+
+
+def _aggregate_movements(first_day, last_day, product_ids=None):
+    """Entradas e saídas por (produto, dia) calculadas direto de Inflow e Outflow."""
+    start, end = day_bounds(first_day, last_day)
+    movements = {}
+    for model, field in ((Inflow, 'inflow_quantity'), (Outflow, 'outflow_quantity')):
+        queryset = model.objects.filter(created_at__gte=start, created_at__lt=end)
+        if product_ids is not None:
+            queryset = queryset.filter(product_id__in=product_ids)
+        rows = (
+            queryset.annotate(day=TruncDate('created_at'))
+                    .values('product_id', 'day')
+                    .annotate(quantity=Sum('quantity'))
+                    .order_by()
+        )
+        for row in rows:
+            key = (row['product_id'], row['day'])
+            movements.setdefault(key, dict(inflow_quantity=0, outflow_quantity=0))[field] = row['quantity']
+    return movements
+
+
+def _stored(model, fields, first_day, last_day):
+    queryset = model.objects.filter(date__gte=first_day, date__lte=last_day)
+    return {
+        (row['product_id'], row['date']): {field: row[field] for field in fields}
+        for row in queryset.values('product_id', 'date', *fields).order_by()
+    }
+
+
+def rebuild_range(first_day, last_day, product_ids=None):
+    """
+    Recalcula as rollups de first_day a last_day (inclusive) a partir das tabelas brutas.
+
+    Tudo acontece em uma transação: quem lê as rollups nunca vê o intervalo vazio. A agregação
+    e a regravação rodam sob o lock exclusivo das rollups (lock_rollups), então uma movimentação
+    confirmada no meio do recálculo não tem o seu incremento apagado; no PostgreSQL, pode rodar
+    com o sistema no ar (as movimentações esperam cada bloco terminar). No SQLite, que não tem
+    advisory locks, rode com as escritas paradas.
+    Retorna a quantidade de linhas (vendas, movimentações) gravadas.
+    """
+    with transaction.atomic():
+        lock_rollups(exclusive=True)
+        sales = _aggregate_sales(first_day, last_day, product_ids)
+        movements = _aggregate_movements(first_day, last_day, product_ids)
+
+        for model in (DailyProductSales, DailyStockMovement):
+            queryset = model.objects.filter(date__gte=first_day, date__lte=last_day)
+            if product_ids is not None:
+                queryset = queryset.filter(product_id__in=product_ids)
+            queryset.delete()
+
+        DailyProductSales.objects.bulk_create(
+            [DailyProductSales(product_id=product_id, date=date, **values)
+             for (product_id, date), values in sales.items()],
+            batch_size=BULK_BATCH_SIZE,
+        )
+        DailyStockMovement.objects.bulk_create(
+            [DailyStockMovement(product_id=product_id, date=date, **values)
+             for (product_id, date), values in movements.items()],
+            batch_size=BULK_BATCH_SIZE,
+        )
+
+    return len(sales), len(movements)
+
+
+def _same_values(expected, stored):
+    # Linhas zeradas (ex.: após estornos) equivalem a linhas ausentes.
+    if not any((expected or {}).values()) and not any((stored or {}).values()):
+        return True
+    return expected == stored
+
+
+def find_discrepancies(first_day, last_day):
+    """
+    Compara as rollups de first_day a last_day com as tabelas brutas.
+
+    Retorna uma lista de tuplas (modelo, product_id, data, esperado, gravado); uma linha
+    ausente de um dos lados aparece como None.
+    """
+    checks = (
+        (DailyProductSales, ('quantity', 'sales_count'), _aggregate_sales(first_day, last_day)),
+        (DailyStockMovement, ('inflow_quantity', 'outflow_quantity'), _aggregate_movements(first_day, last_day)),
+    )
+    discrepancies = []
+    for model, fields, expected in checks:
+        stored = _stored(model, fields, first_day, last_day)
+        for key in sorted(expected.keys() | stored.keys(), key=lambda key: (key[1], key[0])):
+            expected_values = expected.get(key)
+            stored_values = stored.get(key)
+            if not _same_values(expected_values, stored_values):
+                discrepancies.append((model.__name__, key[0], key[1], expected_values, stored_values))
+    return discrepancies
+
+
+def get_history_bounds():
+    """Primeiro e último dia com movimentações registradas, ou None se não houver nenhuma."""
+    dates = []
+    for model in (Inflow, Outflow):
+        first = model.objects.order_by('created_at').values_list('created_at', flat=True).first()
+        last = model.objects.order_by('-created_at').values_list('created_at', flat=True).first()
+        dates.extend(timezone.localdate(value) for value in (first, last) if value is not None)
+    if not dates:
+        return None
+    return min(dates), max(dates)
+
+
+def iter_chunks(first_day, last_day, chunk_days):
+    """Divide [first_day, last_day] em janelas consecutivas de até chunk_days dias."""
+    chunk_start = first_day
+    while chunk_start <= last_day:
+        chunk_end = min(chunk_start + timedelta(days=chunk_days - 1), last_day)
+        yield chunk_start, chunk_end
+        chunk_start = chunk_end + timedelta(days=1)
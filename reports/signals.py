@@ -0,0 +1,40 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from inflows.models import Inflow
+from outflows.models import Outflow
+from reports import services
+
+
+RECORDERS = {
+    Inflow: services.record_inflow,
+    Outflow: services.record_outflow,
+}
+
+
+@receiver(pre_save, sender=Inflow)
+@receiver(pre_save, sender=Outflow)
+def remember_previous_movement(sender, instance, **kwargs):
+    # Em alterações (ex.: PUT na API) guardamos a versão antiga para estorná-la nas rollups.
+    instance._rollup_previous = None
+    if instance.pk:
+        instance._rollup_previous = (
+            sender.objects.filter(pk=instance.pk)
+                          .values_list('product_id', 'created_at', 'quantity')
+                          .first()
+        )
+
+
+@receiver(post_save, sender=Inflow)
+@receiver(post_save, sender=Outflow)
+def update_rollups(sender, instance, created, **kwargs):
+    record = RECORDERS[sender]
+    previous = getattr(instance, '_rollup_previous', None)
+    if not created and previous:
+        record(*previous, sign=-1)
+    record(instance.product_id, instance.created_at, instance.quantity)
+
+
+@receiver(post_delete, sender=Inflow)
+@receiver(post_delete, sender=Outflow)
+def revert_rollups(sender, instance, **kwargs):
+    RECORDERS[sender](instance.product_id, instance.created_at, instance.quantity, sign=-1)
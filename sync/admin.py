@@ -0,0 +1,10 @@
+from django.contrib import admin
+from . import models
+
+
+class ChangeAdmin(admin.ModelAdmin):
+    list_display = ('id', 'model', 'object_id', 'deleted', 'created_at',)
+    list_filter = ('model', 'deleted',)
+
+
+admin.site.register(models.Change, ChangeAdmin)
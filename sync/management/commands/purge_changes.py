@@ -0,0 +1,21 @@
+from datetime import timedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from sync.models import Change
+
+
+class Command(BaseCommand):
+    help = (
+        'Remove do feed de sincronização as alterações mais antigas que --days dias. Clientes '
+        'com cursor anterior ao que foi removido recebem 410 e precisam sincronizar tudo de novo.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=30, help='Dias de alterações mantidos.')
+
+    def handle(self, *args, **options):
+        if options['days'] < 1:
+            raise CommandError('--days deve ser maior que zero.')
+        limit = timezone.now() - timedelta(days=options['days'])
+        deleted, _ = Change.objects.filter(created_at__lt=limit).delete()
+        self.stdout.write(self.style.SUCCESS(f'{deleted} alterações removidas.'))
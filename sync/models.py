@@ -0,0 +1,21 @@
+from django.db import models
+
+
+class Change(models.Model):
+    """
+    Alteração de um produto, entrada ou saída, para o feed de sincronização (/api/v1/changes/).
+
+    O id é a sequência monotônica que os clientes usam como cursor; deleted marca as
+    exclusões (tombstones), que não deixam outro rastro no banco.
+    """
+    id = models.BigAutoField(primary_key=True)
+    model = models.CharField(max_length=20)
+    object_id = models.BigIntegerField()
+    deleted = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        ordering = ['id']
+
+    def __str__(self):
+        return f'{self.model} {self.object_id} ({"exclusão" if self.deleted else "alteração"})'
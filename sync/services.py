@@ -0,0 +1,57 @@
+"""
+Registro de alterações para o feed de sincronização.
+
+Os signals registram o que passa por save()/delete(); caminhos que não disparam signals
+(bulk_create dos importadores, UPDATEs de estoque com F()) chamam record_changes diretamente.
+
+As alterações são gravadas na própria transação da escrita: se ela for desfeita, o registro
+também é, e o que foi confirmado nunca fica fora do feed. Para que a sequência (id) siga a ordem
+dos commits, quem grava no feed segura um advisory lock do PostgreSQL até o fim da transação:
+uma escrita concorrente espera o commit da anterior para pegar o próximo id, e o feed nunca
+entrega um id maior que o de uma alteração ainda não confirmada. Por isso record_changes deve
+ser a última coisa feita nas transações longas (blocos do import_outflows, lotes do
+import_inflows). No SQLite, que só tem uma transação de escrita por vez, a trava não é necessária.
+"""
+from django.db import connection, transaction
+from django.utils.module_loading import import_string
+from sync.models import Change
+
+
+# model_name -> (modelo, serializer usado no feed).
+TRACKED = {
+    'product': ('products.models.Product', 'products.serializers.ProductSerializer'),
+    'inflow': ('inflows.models.Inflow', 'inflows.serializers.InflowSerializer'),
+    'outflow': ('outflows.models.Outflow', 'outflows.serializers.OutflowSerializer'),
+}
+
+FEED_LOCK_KEY = 0x53594E43  # 'SYNC'
+
+
+def lock_feed():
+    """Serializa as gravações no feed até o fim da transação atual (sem efeito fora do PostgreSQL)."""
+    if connection.vendor != 'postgresql':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT pg_advisory_xact_lock(%s)', [FEED_LOCK_KEY])
+
+
+def record_changes(model, pks, deleted=False):
+    """
+    Registra, com um único INSERT na transação atual (ou numa própria, fora de uma), alterações
+    (ou exclusões) dos objetos `pks` de `model`.
+    """
+    changes = [Change(model=model._meta.model_name, object_id=pk, deleted=deleted) for pk in pks]
+    if not changes:
+        return
+    # Sem savepoint: dentro de uma transação, a trava e o INSERT ficam na dela.
+    with transaction.atomic(savepoint=False):
+        lock_feed()
+        Change.objects.bulk_create(changes)
+
+
+def serialize_objects(model_name, pks):
+    """Dados atuais dos objetos ({pk: dados}); os que não existem mais ficam de fora."""
+    model_path, serializer_path = TRACKED[model_name]
+    objects = import_string(model_path).objects.in_bulk(pks)
+    serializer_class = import_string(serializer_path)
+    return {pk: serializer_class(obj).data for pk, obj in objects.items()}
@@ -0,0 +1,20 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from inflows.models import Inflow
+from outflows.models import Outflow
+from products.models import Product
+from sync.services import record_changes
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_save, sender=Inflow)
+@receiver(post_save, sender=Outflow)
+def record_save(sender, instance, **kwargs):
+    record_changes(sender, [instance.pk])
+
+
+@receiver(post_delete, sender=Product)
+@receiver(post_delete, sender=Inflow)
+@receiver(post_delete, sender=Outflow)
+def record_delete(sender, instance, **kwargs):
+    record_changes(sender, [instance.pk], deleted=True)
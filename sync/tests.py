@@ -0,0 +1,72 @@
+import threading
+from unittest import skipUnless
+from django.contrib.auth.models import User
+from django.db import connection, connections, transaction
+from django.test import TestCase, TransactionTestCase
+from rest_framework.test import APIClient
+from products.models import Product
+from sync.models import Change
+from sync.services import record_changes
+
+
+class ChangeFeedTest(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_superuser('admin', password='admin'))
+
+    def feed(self, since):
+        return self.client.get('/api/v1/changes/', {'since': since}).json()
+
+    def test_change_is_recorded_in_the_writing_transaction(self):
+        with transaction.atomic():
+            record_changes(Product, [1])
+            self.assertTrue(Change.objects.filter(object_id=1).exists())
+        page = self.feed(0)
+        self.assertEqual([change['id'] for change in page['results']], [1])
+
+    def test_rolled_back_change_is_not_recorded(self):
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                record_changes(Product, [1])
+                raise RuntimeError
+        self.assertFalse(Change.objects.exists())
+
+
+@skipUnless(connection.vendor == 'postgresql', 'O advisory lock do feed só existe no PostgreSQL.')
+class ChangeFeedOrderTest(TransactionTestCase):
+
+    def test_concurrent_writer_waits_for_the_commit(self):
+        # A transação lenta grava o produto 1 primeiro; a do produto 2 só pega o id depois do commit dela.
+        recorded = threading.Event()
+        release = threading.Event()
+        finished = threading.Event()
+
+        def slow_transaction():
+            try:
+                with transaction.atomic():
+                    record_changes(Product, [1])
+                    recorded.set()
+                    release.wait(5)
+            finally:
+                connections.close_all()
+
+        def fast_transaction():
+            try:
+                with transaction.atomic():
+                    record_changes(Product, [2])
+                finished.set()
+            finally:
+                connections.close_all()
+
+        slow = threading.Thread(target=slow_transaction)
+        slow.start()
+        recorded.wait(5)
+        fast = threading.Thread(target=fast_transaction)
+        fast.start()
+        self.assertFalse(finished.wait(0.5))
+
+        release.set()
+        slow.join()
+        fast.join()
+        self.assertEqual(list(Change.objects.order_by('id').values_list('object_id', flat=True)), [1, 2])
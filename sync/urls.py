@@ -0,0 +1,6 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('api/v1/changes/', views.ChangeFeedAPIView.as_view(), name='change_feed_api_view'),
+]
@@ -0,0 +1,83 @@
+from django.db.models import Min
+from rest_framework import generics, status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from sync.models import Change
+from sync.services import serialize_objects
+
+
+class ChangeFeedAPIView(generics.GenericAPIView):
+    """
+    Feed de alterações de produtos, entradas e saídas: GET /api/v1/changes/?since=<seq>&limit=<n>.
+
+    Retorna as alterações com sequência maior que `since`, em ordem, com os dados atuais de cada
+    objeto (ou deleted=true para exclusões), e `next_since` para a próxima chamada. Um objeto
+    alterado várias vezes na mesma página aparece uma vez só, com a última sequência.
+
+    Primeira sincronização: uma chamada sem `since` retorna só o `next_since` da posição atual;
+    guarde-o, baixe as listagens completas e continue dali. Se o cliente ficou parado além da
+    retenção do purge_changes, a resposta é 410 e ele precisa baixar tudo de novo.
+
+    As sequências são gravadas na transação de cada escrita e confirmadas em ordem (ver
+    sync.services): um id visível nunca tem antes dele um id que ainda vai aparecer.
+    """
+    queryset = Change.objects.all()
+    pagination_class = None
+    filter_backends = ()
+    default_limit = 500
+    max_limit = 1000
+
+    def get(self, request):
+        since = self.get_int_param('since', None)
+        limit = min(self.get_int_param('limit', self.default_limit), self.max_limit) or self.default_limit
+
+        oldest = Change.objects.aggregate(oldest=Min('id'))['oldest']
+        if since and oldest and since < oldest - 1:
+            return Response(
+                {'detail': 'Alterações anteriores a este cursor foram removidas; sincronize tudo novamente.'},
+                status=status.HTTP_410_GONE,
+            )
+
+        if since is None:
+            head = Change.objects.order_by('-id').values_list('id', flat=True).first()
+            return Response({'results': [], 'next_since': head or 0, 'has_more': False})
+
+        changes = list(Change.objects.filter(id__gt=since).order_by('id')[:limit + 1])
+        has_more = len(changes) > limit
+        changes = changes[:limit]
+        latest = {}
+        for change in changes:
+            key = (change.model, change.object_id)
+            latest.pop(key, None)
+            latest[key] = change
+
+        data = {}
+        for model_name in {change.model for change in latest.values()}:
+            pks = [change.object_id for change in latest.values() if change.model == model_name and not change.deleted]
+            data[model_name] = serialize_objects(model_name, pks)
+
+        results = []
+        for change in latest.values():
+            obj = None if change.deleted else data[change.model].get(change.object_id)
+            results.append({
+                'seq': change.id,
+                'model': change.model,
+                'id': change.object_id,
+                # Sem dados, o objeto foi excluído depois: o tombstone vem numa sequência posterior.
+                'deleted': obj is None,
+                'data': obj,
+            })
+
+        return Response({
+            'results': results,
+            'next_since': changes[-1].id if changes else since,
+            'has_more': has_more,
+        })
+
+    def get_int_param(self, name, default):
+        value = self.request.query_params.get(name)
+        if value in (None, ''):
+            return default
+        if not value.isdigit():
+            raise ValidationError({name: 'Informe um número inteiro não negativo.'})
+        return int(value)